@@ -0,0 +1,7 @@
+"""Общие модули проверяющих скриптов (tools/) доступны тестам"""
+import sys
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
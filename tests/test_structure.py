@@ -2,13 +2,11 @@
 import pytest
 from pathlib import Path
 
-PROJECT_ROOT = Path("you_playwright")
-REQUIRED_FILES = [
-    "run_chromium.py",
-    "run_firefox.py",
-    "run_webkit.py",
-    "info_headless.py",
-]
+import task_spec
+
+TASK = task_spec.load()
+PROJECT_ROOT = Path(TASK.project_dir)
+REQUIRED_FILES = TASK.file_names
 
 @pytest.mark.structure
 def test_project_folder_exists():
@@ -0,0 +1,115 @@
+"""Кэш разбора файлов работы: исходник и AST
+
+Файл читается один раз и идентифицируется путём и SHA-256 содержимого
+(хэш считается по байтам: ключи кэшей линтеров есть и у файла не в UTF-8,
+он не декодируется, пока не понадобится текст или AST).
+Разобранные AST хранятся по хэшу, поэтому одинаковые файлы
+разных студентов (например, неизменённые шаблоны) разбираются один раз
+на процесс. Повторное обращение к неизменённому файлу не читает его заново:
+достаточно совпадения размера и mtime.
+"""
+import ast
+import hashlib
+import os
+import threading
+
+import limits
+import result_cache
+import timing
+
+class ParsedSource:
+    """Разбор содержимого, общий для всех файлов с одинаковым хэшем"""
+    __slots__ = ("_data", "_source", "_tree", "_error", "_lock")
+
+    def __init__(self, data):
+        self._data = data
+        self._source = None
+        self._tree = None
+        self._error = None
+        # Одинаковые файлы разбираются из потоков конвейера одновременно
+        self._lock = threading.RLock()
+
+    @property
+    def source(self):
+        """Текст файла (однократное декодирование UTF-8); UnicodeDecodeError
+        пробрасывается при каждом обращении"""
+        with self._lock:
+            if self._source is None:
+                self._source = self._data.decode("utf-8")
+                self._data = None
+            return self._source
+
+    def tree(self, filename="<unknown>"):
+        """AST (однократный разбор); SyntaxError пробрасывается при каждом вызове"""
+        with self._lock:
+            if self._tree is None and self._error is None:
+                try:
+                    with timing.span("ast.parse"):
+                        self._tree = ast.parse(self.source, filename=filename)
+                except SyntaxError as e:
+                    self._error = e
+                except (RecursionError, MemoryError):
+                    self._error = limits.NestingTooDeep("слишком глубокая вложенность кода")
+            if self._error is not None:
+                raise self._error
+            return self._tree
+
+class FileAnalysis:
+    """Результат анализа конкретного файла: путь, хэш и общий разбор"""
+    __slots__ = ("path", "digest", "parsed")
+
+    def __init__(self, path, digest, parsed):
+        self.path = path
+        self.digest = digest
+        self.parsed = parsed
+
+    @property
+    def source(self):
+        return self.parsed.source
+
+    @property
+    def tree(self):
+        return self.parsed.tree(str(self.path))
+
+_by_path = {}    # абсолютный путь → ((размер, mtime), FileAnalysis)
+_by_digest = result_cache.MemoryCache()  # SHA-256 → ParsedSource
+
+def analyze(path):
+    """Анализ файла с кэшированием по пути и хэшу содержимого
+
+    FileNotFoundError и limits.FileTooLarge (файл не читается, если он больше
+    лимита) пробрасываются вызывающему; UnicodeDecodeError — при обращении
+    к .source или .tree.
+    """
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    message = limits.oversized(key, st.st_size)
+    if message is not None:
+        raise limits.FileTooLarge(message)
+    signature = (st.st_size, st.st_mtime_ns)
+    cached = _by_path.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with open(key, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    parsed = _by_digest.get(digest)
+    if parsed is None:
+        parsed = ParsedSource(data)
+        _by_digest[digest] = parsed
+
+    analysis = FileAnalysis(path, digest, parsed)
+    _by_path[key] = (signature, analysis)
+    return analysis
+
+def forget(root):
+    """Удаление записей файлов из каталога root (по пути; разбор по хэшу остаётся)"""
+    prefix = os.path.join(os.path.abspath(root), "")
+    for key in [key for key in _by_path if key.startswith(prefix)]:
+        del _by_path[key]
+
+def clear():
+    """Сброс кэша (например, между прогонами в долгоживущем процессе)"""
+    _by_path.clear()
+    _by_digest.clear()
@@ -0,0 +1,287 @@
+"""Однопроходный анализ AST скрипта Playwright
+
+Вместо отдельных регулярных выражений по всему исходнику дерево обходится
+один раз, и за этот обход собираются все факты, нужные проверкам:
+
+- импорты `from <модуль> import <имя>`;
+- вызовы <выражение>.<браузер>.launch(...) с именованными аргументами
+  (литерал может прийти через переменную) и имена всех вызываемых функций
+  и методов;
+- что именно попадает в print(): заголовок страницы, User-Agent,
+  размер viewport, URL (с учётом передачи через переменные, функции,
+  методы и lambda).
+
+Функция может быть объявлена ниже места вызова, поэтому обход повторяется,
+пока не перестанут меняться значения, возвращаемые функциями (обычно два
+прохода; без функций — один).
+
+Какие из фактов обязательны для каждого файла, задаёт task_spec.json.
+
+Комментарии и строки не являются узлами AST, поэтому закомментированный
+`headless=True` или слово «title» в тексте больше не засчитываются.
+"""
+import ast
+
+import result_cache
+import timing
+
+BROWSERS = ("chromium", "firefox", "webkit")
+
+# Категории значений, которые отслеживаются до print()
+TITLE = "title"
+USER_AGENT = "user_agent"
+VIEWPORT = "viewport"
+URL = "url"
+
+# Методы страницы, возвращающие содержимое (для httpbin.org/user-agent
+# в нём и есть User-Agent — см. подсказку в README)
+CONTENT_METHODS = {"content", "inner_text", "text_content", "inner_html"}
+VIEWPORT_JS = ("innerWidth", "innerHeight", "outerWidth", "outerHeight")
+_EMPTY = frozenset()
+MAX_PASSES = 5  # проходов до устойчивых значений функций (цепочки вспомогательных функций)
+
+class Launch:
+    """Вызов <p>.<браузер>.launch(...)"""
+    __slots__ = ("browser", "kwargs", "lineno")
+
+    def __init__(self, browser, kwargs, lineno):
+        self.browser = browser
+        self.kwargs = kwargs
+        self.lineno = lineno
+
+    def as_dict(self):
+        return {"browser": self.browser, "kwargs": self.kwargs, "line": self.lineno}
+
+class Findings:
+    """Все факты о файле, собранные за один обход"""
+    __slots__ = ("imports", "launches", "calls", "printed")
+
+    def __init__(self):
+        self.imports = set()   # (модуль, имя) из from-импортов
+        self.launches = []
+        self.calls = set()     # имена вызванных функций и методов
+        self.printed = set()
+
+    @property
+    def imports_sync_playwright(self):
+        return ("playwright.sync_api", "sync_playwright") in self.imports
+
+    def launches_browser(self, browser):
+        return any(launch.browser == browser for launch in self.launches)
+
+    @property
+    def headless(self):
+        """Хотя бы один браузер запущен с явным headless=True"""
+        return any(launch.kwargs.get("headless") is True for launch in self.launches)
+
+    def prints(self, category):
+        return category in self.printed
+
+    def as_dict(self):
+        return {
+            "imports_sync_playwright": self.imports_sync_playwright,
+            "imports": sorted(f"{module}.{name}" for module, name in self.imports),
+            "launches": [launch.as_dict() for launch in self.launches],
+            "calls": sorted(self.calls),
+            "headless": self.headless,
+            "printed": sorted(self.printed),
+        }
+
+def _literal(node):
+    """Значение аргумента, если это литерал, иначе исходный текст выражения"""
+    try:
+        value = ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        return ast.unparse(node)
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return ast.unparse(node)
+
+def _target_names(target):
+    """Имена, которым присваивается значение (включая распаковку)"""
+    if isinstance(target, ast.Name):
+        return [target.id]
+    if isinstance(target, (ast.Tuple, ast.List)):
+        return [name for elt in target.elts for name in _target_names(elt)]
+    if isinstance(target, ast.Starred):
+        return _target_names(target.value)
+    return []
+
+class RuleVisitor:
+    """Обход AST снизу вверх: каждый узел возвращает категории своего значения"""
+
+    def __init__(self, functions=None):
+        self.findings = Findings()
+        self.names = {}       # переменная → категории присвоенного значения
+        self.constants = {}   # переменная → присвоенный литерал (для аргументов launch)
+        # функция, метод или lambda → категории возвращаемого значения
+        # (с прошлого прохода — для функций, объявленных ниже вызова)
+        self.functions = dict(functions or {})
+        self.returns = []     # стек категорий return для текущих функций
+
+    def visit(self, node):
+        method = getattr(self, "visit_" + type(node).__name__, None)
+        if method is not None:
+            return method(node)
+        return self.generic_visit(node)
+
+    def generic_visit(self, node):
+        taint = set()
+        for child in ast.iter_child_nodes(node):
+            taint |= self.visit(child)
+        return taint
+
+    def _assign(self, targets, taint):
+        for target in targets:
+            for name in _target_names(target):
+                self.names[name] = self.names.get(name, _EMPTY) | taint
+
+    def visit_ImportFrom(self, node):
+        if node.module and not node.level:
+            self.findings.imports.update((node.module, alias.name) for alias in node.names)
+        return set()
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            return set(self.names.get(node.id, _EMPTY))
+        return set()
+
+    def visit_Attribute(self, node):
+        taint = self.visit(node.value)
+        if node.attr == "url":
+            taint.add(URL)
+        elif node.attr == "viewport_size":
+            taint.add(VIEWPORT)
+        return taint
+
+    def visit_Assign(self, node):
+        if isinstance(node.value, ast.Lambda):
+            # get_title = lambda page: page.title() — функция, а не значение
+            taint = self.visit(node.value.body)
+            for target in node.targets:
+                for name in _target_names(target):
+                    self.functions[name] = taint
+            return set()
+        taint = self.visit(node.value)
+        self._assign(node.targets, taint)
+        for target in node.targets:
+            for name in _target_names(target):
+                if isinstance(target, ast.Name) and isinstance(node.value, ast.Constant):
+                    self.constants[name] = node.value.value
+                else:
+                    self.constants.pop(name, None)
+        return set()
+
+    def visit_AnnAssign(self, node):
+        taint = self.visit(node.value) if node.value is not None else set()
+        self._assign([node.target], taint)
+        return set()
+
+    def visit_AugAssign(self, node):
+        self._assign([node.target], self.visit(node.value))
+        return set()
+
+    def visit_NamedExpr(self, node):
+        taint = self.visit(node.value)
+        self._assign([node.target], taint)
+        return taint
+
+    def visit_For(self, node):
+        self._assign([node.target], self.visit(node.iter))
+        for stmt in node.body + node.orelse:
+            self.visit(stmt)
+        return set()
+
+    def visit_FunctionDef(self, node):
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        self.returns.append(set())
+        for stmt in node.body:
+            self.visit(stmt)
+        self.functions[node.name] = self.returns.pop()
+        return set()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Return(self, node):
+        taint = self.visit(node.value) if node.value is not None else set()
+        if self.returns:
+            self.returns[-1] |= taint
+        return set()
+
+    def visit_Call(self, node):
+        func = node.func
+        taint = self.visit(func) if isinstance(func, ast.Attribute) else set()
+        args_taint = set()
+        for arg in node.args:
+            args_taint |= self.visit(arg)
+        for keyword in node.keywords:
+            args_taint |= self.visit(keyword.value)
+
+        if isinstance(func, ast.Name):
+            self.findings.calls.add(func.id)
+            if func.id == "print":
+                self.findings.printed |= args_taint
+                return set()
+            return args_taint | self.functions.get(func.id, _EMPTY)
+
+        if isinstance(func, ast.Attribute):
+            self.findings.calls.add(func.attr)
+            self._check_launch(node, func)
+            taint |= self.functions.get(func.attr, _EMPTY)  # метод класса работы
+            if func.attr == "title" and not node.args:
+                taint.add(TITLE)
+            elif func.attr in CONTENT_METHODS:
+                taint.add(USER_AGENT)
+            elif func.attr == "evaluate" and node.args:
+                script = node.args[0]
+                if isinstance(script, ast.Constant) and isinstance(script.value, str):
+                    if "userAgent" in script.value:
+                        taint.add(USER_AGENT)
+                    if any(prop in script.value for prop in VIEWPORT_JS):
+                        taint.add(VIEWPORT)
+        return taint | args_taint
+
+    def _argument(self, node):
+        if isinstance(node, ast.Name) and node.id in self.constants:
+            return self.constants[node.id]
+        return _literal(node)
+
+    def _check_launch(self, node, func):
+        """Запись вызова <выражение>.<браузер>.launch(...): p.chromium,
+        self.p.chromium и т. п."""
+        owner = func.value
+        if func.attr == "launch" and isinstance(owner, ast.Attribute) and owner.attr in BROWSERS:
+            kwargs = {kw.arg: self._argument(kw.value) for kw in node.keywords if kw.arg}
+            self.findings.launches.append(Launch(owner.attr, kwargs, node.lineno))
+
+def scan(tree):
+    """Обход дерева со сбором всех фактов
+
+    Проход повторяется со значениями функций с прошлого прохода, пока они
+    меняются: так учитываются функции, объявленные ниже места вызова.
+    """
+    functions = {}
+    for _ in range(MAX_PASSES):
+        visitor = RuleVisitor(functions)
+        visitor.visit(tree)
+        if visitor.functions == functions:
+            break
+        functions = visitor.functions
+    return visitor.findings
+
+_findings = result_cache.MemoryCache()  # SHA-256 содержимого → Findings
+
+def findings_for(analysis):
+    """Факты для файла из кэша разбора (обход выполняется один раз на содержимое)"""
+    findings = _findings.get(analysis.digest)
+    if findings is None:
+        tree = analysis.tree
+        with timing.span("ast.rules"):
+            findings = scan(tree)
+        _findings[analysis.digest] = findings
+    return findings
+
+def clear():
+    """Сброс кэша фактов (например, между прогонами бенчмарка)"""
+    _findings.clear()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Пакетная проверка работ всей группы в пуле процессов
+
+Каталог с работами содержит по подпапке на студента (внутри — you_playwright/),
+либо используется манифест: по одному пути к работе на строку.
+
+    python tools/batch_grade.py submissions/ -o reports/ -j 8
+    python tools/batch_grade.py --manifest cohort.txt -o reports/
+    python tools/batch_grade.py submissions/ --template solution/
+
+Попутно обновляется индекс похожести работ (reports/similarity.json,
+tools/similarity.py), а группы похожих работ попадают в COHORT.md.
+Результаты каждого прогона дописываются в reports/results.sqlite3
+(tools/results_store.py) для аналитики по группе.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import check_linters
+import incremental
+import report
+import results_store
+import similarity
+
+def discover_submissions(submissions_dir):
+    """Поиск работ: каждая подпапка каталога — отдельный студент"""
+    root = Path(submissions_dir)
+    return [
+        (entry.name, str(entry))
+        for entry in sorted(root.iterdir())
+        if entry.is_dir() and not entry.name.startswith(".")
+    ]
+
+def read_manifest(manifest_path):
+    """Чтение манифеста: путь к работе на строку, # — комментарий
+
+    Имя студента — имя каталога работы; два пути с одинаковым именем
+    (a/ivanov и b/ivanov) — ValueError, иначе отчёты перезапишут друг друга.
+    """
+    base = Path(manifest_path).parent
+    submissions = []
+    seen = {}
+    with open(manifest_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path = Path(line)
+            if not path.is_absolute():
+                path = base / path
+            if path.name in seen:
+                raise ValueError(
+                    f"{manifest_path}: работы {seen[path.name]} и {path} "
+                    f"дают одно имя студента «{path.name}»"
+                )
+            seen[path.name] = path
+            submissions.append((path.name, str(path)))
+    return submissions
+
+SIMILARITY_INDEX = "similarity.json"
+RESULTS_STORE = "results.sqlite3"
+STAGES = ["structure", "syntax", "linters"]  # без запуска скриптов
+
+def grade_submission(name, root, out_dir, template=similarity.NO_TEMPLATE):
+    """Проверка одной работы: структура, синтаксис, линтеры (в процессе пула)"""
+    started = time.perf_counter()
+    student_dir = Path(out_dir) / name
+    student_dir.mkdir(parents=True, exist_ok=True)
+
+    # Как и в CI: этапы работы — асинхронным конвейером (tools/pipeline.py),
+    # с GRADER_INCREMENTAL — только для файлов, изменённых с прошлой проверки
+    grading = incremental.grade(root, STAGES)
+    if grading.linters is not None:
+        check_linters.save_results(grading.linters, student_dir / "linters_result.json")
+
+    # Отчёты перезаписываются, только если результаты работы изменились
+    result = grading.report()
+    rendered = report.write_if_changed(result, student_dir)
+
+    # Сигнатуры для индекса похожести: AST файлов уже разобран этапом синтаксиса
+    signatures = similarity.submission_signatures(root, template=template)
+
+    return {
+        "student": name,
+        "path": root,
+        "passed": result.exit_code == 0,
+        "structure_ok": grading.structure_ok,
+        "files": grading.syntax["file_status"],
+        "linters_total": result.linters_total,
+        "rendered": rendered,
+        "seconds": round(time.perf_counter() - started, 3),
+        "signatures": signatures,
+        "record": results_store.run_record(name, result, grading.files,
+                                           incremental.head_commit(root)),
+    }
+
+def write_cohort_report(results, out_dir, stats, clusters=()):
+    """Сводка по группе: cohort.json и COHORT.md"""
+    with open(Path(out_dir) / "cohort.json", "w", encoding="utf-8") as f:
+        json.dump({"stats": stats, "students": results, "similar": list(clusters)}, f,
+                  ensure_ascii=False, indent=2)
+
+    lines = []
+    lines.append(f"# 📊 Сводка по группе: {report.TASK.title}")
+    lines.append("")
+    lines.append(f"- Работ: **{stats['students']}**, зачёт: **{stats['passed']}**, "
+                 f"отчётов обновлено: {stats['rendered']}")
+    lines.append(f"- Общее время: {stats['wall_seconds']} с, процессов: {stats['workers']}")
+    lines.append(f"- Пропускная способность: {stats['per_second']} работ/с "
+                 f"({stats['per_core_per_second']} работ/с на ядро)")
+    lines.append("")
+    lines.append("| Студент | Файлы | Линтеры | Итог | Время, с |")
+    lines.append("|---------|-------|---------|------|----------|")
+    for r in results:
+        if "error" in r:
+            lines.append(f"| `{r['student']}` | — | — | 💥 {r['error']} | — |")
+            continue
+        files_ok = sum(r["files"].values())
+        linters = "—" if r["linters_total"] is None else f"{r['linters_total']}/20"
+        verdict = "✅ зачёт" if r["passed"] else "⚠️ доработка"
+        lines.append(f"| `{r['student']}` | {files_ok}/{len(r['files'])} | {linters} | "
+                     f"{verdict} | {r['seconds']} |")
+    lines.append("")
+    if clusters:
+        lines.append("## 🔎 Похожие работы")
+        lines.append("")
+        lines.append("| Сходство | Работы |")
+        lines.append("|----------|--------|")
+        for cluster in clusters:
+            students = ", ".join(f"`{student}`" for student in cluster["students"])
+            lines.append(f"| {cluster['similarity']:.0%} | {students} |")
+        lines.append("")
+    with open(Path(out_dir) / "COHORT.md", "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+def update_similarity(results, out_dir, template=similarity.NO_TEMPLATE):
+    """Пополнение индекса похожести сигнатурами проверенных работ → кластеры
+
+    Работы, которых нет в этом прогоне, остаются в индексе с прошлых запусков.
+    """
+    path = Path(out_dir) / SIMILARITY_INDEX
+    index = similarity.SimilarityIndex.load(path, template=template)
+    for r in results:
+        signatures = r.pop("signatures", None)
+        if signatures is not None:
+            index.update(r["student"], signatures)
+    index.save(path)
+    return index.clusters()
+
+def store_results(results, out_dir):
+    """Запись прогонов в хранилище результатов группы одной транзакцией"""
+    records = [r.pop("record") for r in results if "record" in r]
+    store = results_store.ResultsStore(Path(out_dir) / RESULTS_STORE)
+    try:
+        return store.append(records)
+    finally:
+        store.close()
+
+def grade_cohort(submissions, out_dir, workers=None, template=None):
+    """Проверка всех работ в пуле процессов, возврат результатов и статистики"""
+    template = similarity.Template(template) if template else similarity.NO_TEMPLATE
+    workers = workers or os.cpu_count() or 1
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(grade_submission, name, root, out_dir, template): name
+            for name, root in submissions
+        }
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({"student": futures[future], "passed": False, "error": str(e)})
+    results.sort(key=lambda r: r["student"])
+    clusters = update_similarity(results, out_dir, template)
+    store_results(results, out_dir)
+
+    wall = time.perf_counter() - started
+    per_second = len(results) / wall if wall else 0.0
+    stats = {
+        "students": len(results),
+        "passed": sum(1 for r in results if r["passed"]),
+        "rendered": sum(1 for r in results if r.get("rendered")),
+        "workers": workers,
+        "wall_seconds": round(wall, 3),
+        "per_second": round(per_second, 2),
+        "per_core_per_second": round(per_second / workers, 2),
+        "similar": sum(len(cluster["students"]) for cluster in clusters),
+    }
+    write_cohort_report(results, out_dir, stats, clusters)
+    return results, stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетная проверка работ группы")
+    parser.add_argument("submissions", nargs="?", help="каталог с работами студентов")
+    parser.add_argument("--manifest", help="файл со списком путей к работам")
+    parser.add_argument("-o", "--output", default="reports", help="каталог для отчётов")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="число процессов")
+    parser.add_argument("--template", help="работа с общим кодом для индекса похожести")
+    args = parser.parse_args()
+
+    if args.manifest:
+        try:
+            submissions = read_manifest(args.manifest)
+        except ValueError as e:
+            parser.error(str(e))
+    elif args.submissions:
+        submissions = discover_submissions(args.submissions)
+    else:
+        parser.error("укажите каталог с работами или --manifest")
+
+    if not submissions:
+        print("❌ Не найдено ни одной работы")
+        return 1
+
+    results, stats = grade_cohort(submissions, args.output, args.jobs, args.template)
+
+    for r in results:
+        mark = "✅" if r["passed"] else "❌"
+        print(f"{mark} {r['student']}")
+    print(f"\n📊 Работ: {stats['students']}, зачёт: {stats['passed']}, "
+          f"отчётов обновлено: {stats['rendered']}")
+    print(f"⏱️  Время: {stats['wall_seconds']} с на {stats['workers']} процессах "
+          f"({stats['per_second']} работ/с, {stats['per_core_per_second']} работ/с на ядро)")
+    if stats["similar"]:
+        print(f"🔎 Похожих работ: {stats['similar']} (см. COHORT.md)")
+    print(f"📁 Отчёты: {args.output}/")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
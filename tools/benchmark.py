@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""Бенчмарк проверяющих скриптов на синтетических наборах работ
+
+Генерирует наборы you_playwright/ на 10, 100, 1000 студентов: корректные,
+сломанные (синтаксис, нет файла), с большим числом замечаний линтеров и
+патологически большие файлы. Затем измеряет:
+
+- pipeline  — полный путь CI: generate_summary.py (структура, синтаксис
+              и линтеры одним конвейером) отдельным процессом в каталоге
+              каждой работы;
+- detectors — разбор и однопроходные правила AST на каждом файле.
+
+Для каждого замера — p50/p95 задержки, пропускная способность и пиковый RSS.
+С --baseline результаты сравниваются с сохранённым эталоном, и регрессия
+сверх допуска завершает бенчмарк с кодом 1.
+
+    python tools/benchmark.py --sizes 10,100 --save-baseline bench_baseline.json
+    python tools/benchmark.py --sizes 10,100 --baseline bench_baseline.json
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import analysis_cache
+import ast_rules
+import limits
+
+TOOLS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = TOOLS_DIR.parent
+CONFIGS = [".flake8", ".pylintrc"]
+
+# Доля видов работ в наборе
+KINDS = [("valid", 50), ("broken", 15), ("lint_heavy", 25), ("pathological", 10)]
+
+URLS = {
+    "chromium": "https://demoqa.com",
+    "firefox": "https://github.com",
+    "webkit": "https://apple.com",
+}
+
+# === Генерация работ ===
+
+def valid_browser_script(browser, tag):
+    return (
+        f"# {tag}\n"
+        "from playwright.sync_api import sync_playwright\n\n\n"
+        "with sync_playwright() as p:\n"
+        f"    browser = p.{browser}.launch()\n"
+        "    page = browser.new_page()\n"
+        f'    page.goto("{URLS[browser]}")\n'
+        "    print(page.title())\n"
+        "    browser.close()\n"
+    )
+
+def valid_headless_script(tag):
+    return (
+        f"# {tag}\n"
+        "from playwright.sync_api import sync_playwright\n\n\n"
+        "with sync_playwright() as p:\n"
+        "    browser = p.chromium.launch(headless=True)\n"
+        "    page = browser.new_page()\n"
+        '    page.goto("https://httpbin.org/user-agent")\n'
+        '    print("User-Agent:", page.evaluate("navigator.userAgent"))\n'
+        '    print("Viewport:", page.viewport_size)\n'
+        '    print("URL:", page.url)\n'
+        "    browser.close()\n"
+    )
+
+def lint_heavy(source, rng):
+    """Тот же код с лишними импортами, пробелами и длинными строками"""
+    noise = ["import os", "import sys", "import json", "x=1", "y =  2 ;z=3",
+             "unused = [ 1,2 ,3 ]", "# " + "очень длинный комментарий " * 6]
+    lines = source.splitlines()
+    for _ in range(rng.randint(5, 15)):
+        lines.insert(rng.randint(1, len(lines)), rng.choice(noise) + " " * rng.randint(0, 3))
+    return "\n".join(lines) + "\n"
+
+def pathological(source, lines):
+    """Огромный файл: тысячи присваиваний и глубоко вложенное выражение"""
+    body = [f"value_{i} = [{i}, ({i} + 1) * 2, {{'k': {i}}}]" for i in range(lines)]
+    nested = "[" * 60 + "0" + "]" * 60
+    return source + "\n".join(body) + f"\nDEEP = {nested}\n"
+
+def write_submission(root, kind, rng, large_lines):
+    """Запись одной работы вида kind в каталог root"""
+    project = root / "you_playwright"
+    project.mkdir(parents=True, exist_ok=True)
+    for config in CONFIGS:
+        if (REPO_ROOT / config).exists():
+            shutil.copy(REPO_ROOT / config, root / config)
+
+    tag = f"student {root.name}"
+    files = {f"run_{b}.py": valid_browser_script(b, tag) for b in URLS}
+    files["info_headless.py"] = valid_headless_script(tag)
+
+    if kind == "broken":
+        victim = rng.choice(sorted(files))
+        if rng.random() < 0.5:
+            del files[victim]
+        else:
+            files[victim] = files[victim].replace("with sync_playwright() as p:",
+                                                  "with sync_playwright() as p")
+    elif kind == "lint_heavy":
+        files = {name: lint_heavy(source, rng) for name, source in files.items()}
+    elif kind == "pathological":
+        victim = rng.choice(sorted(files))
+        files[victim] = pathological(files[victim], large_lines)
+
+    for name, source in files.items():
+        (project / name).write_text(source, encoding="utf-8")
+
+def generate_corpus(directory, size, seed=0, large_lines=5000):
+    """Набор из size работ; возвращает [(каталог, вид)]"""
+    rng = random.Random(f"{seed}-{size}")
+    kinds = [kind for kind, weight in KINDS for _ in range(weight)]
+    corpus = []
+    for i in range(size):
+        kind = rng.choice(kinds)
+        root = Path(directory) / f"student_{i:04d}"
+        write_submission(root, kind, rng, large_lines)
+        corpus.append((root, kind))
+    return corpus
+
+# === Замеры ===
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(samples, wall, units, rss_kb):
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "throughput_per_s": round(units / wall, 3) if wall else 0.0,
+        "peak_rss_mb": round(rss_kb / 1024, 1),
+    }
+
+def grade_with_cli(root, env):
+    """Полный путь CI для одной работы: generate_summary.py отдельным процессом
+    (линтеры он запускает сам, отдельного шага check_linters.py в CI нет)
+
+    Код 1 — работа не прошла проверку, это обычный результат; любой другой
+    код — сбой проверяющего (RuntimeError), такой замер считать нельзя.
+    """
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, str(TOOLS_DIR / "generate_summary.py")], cwd=root,
+                            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            text=True, check=False)
+    elapsed = time.perf_counter() - started
+    if result.returncode not in (0, 1):
+        lines = result.stderr.strip().splitlines()
+        raise RuntimeError(f"{root}: generate_summary.py завершился с кодом {result.returncode}"
+                           + (f": {lines[-1]}" if lines else ""))
+    return elapsed
+
+def bench_pipeline(corpus, jobs, use_daemon=False):
+    env = dict(os.environ, GRADER_NO_CACHE="1")
+    env.pop("GRADER_TIMINGS", None)
+    if not use_daemon:
+        env["GRADER_NO_LINTER_DAEMON"] = "1"
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        samples = list(pool.map(lambda item: grade_with_cli(item[0], env), corpus))
+    wall = time.perf_counter() - started
+    rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return summarize(samples, wall, len(corpus), rss)
+
+def bench_detectors(corpus):
+    analysis_cache.clear()
+    ast_rules.clear()
+    samples = []
+    started = time.perf_counter()
+    for root, _ in corpus:
+        for path in sorted((root / "you_playwright").glob("*.py")):
+            t0 = time.perf_counter()
+            try:
+                ast_rules.findings_for(analysis_cache.analyze(path))
+            except (SyntaxError, limits.LimitExceeded):
+                pass
+            samples.append(time.perf_counter() - t0)
+    wall = time.perf_counter() - started
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return summarize(samples, wall, len(samples), rss)
+
+# === Сравнение с эталоном ===
+
+def compare(results, baseline, tolerance, min_delta_ms=1.0):
+    """Список регрессий относительно эталона (пустой — регрессий нет)
+
+    Разница задержки меньше min_delta_ms считается шумом измерения.
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            limit = max(previous[metric] * (1 + tolerance), previous[metric] + min_delta_ms)
+            if current[metric] > limit:
+                regressions.append(f"{key}: {metric} {previous[metric]} → {current[metric]}")
+        if current["throughput_per_s"] < previous["throughput_per_s"] * (1 - tolerance):
+            regressions.append(f"{key}: throughput_per_s {previous['throughput_per_s']} → "
+                               f"{current['throughput_per_s']}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк проверки на синтетических работах")
+    parser.add_argument("--sizes", default="10", help="размеры наборов через запятую (10,100,1000)")
+    parser.add_argument("--modes", default="pipeline,detectors", help="pipeline и/или detectors")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="параллельных работ в pipeline")
+    parser.add_argument("--daemon", action="store_true", help="разрешить демон линтеров")
+    parser.add_argument("--large-lines", type=int, default=5000, help="строк в патологическом файле")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=None, help="каталог для наборов (по умолчанию временный)")
+    parser.add_argument("--output", default=None, help="куда записать результаты (JSON)")
+    parser.add_argument("--baseline", default=None, help="эталон для сравнения")
+    parser.add_argument("--save-baseline", default=None, help="сохранить результаты как эталон")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="допустимое ухудшение (доля)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="порог шума задержки, мс")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="grader-bench-"))
+
+    results = {}
+    for size in sizes:
+        corpus_dir = workdir / f"corpus_{size}"
+        if corpus_dir.exists():
+            shutil.rmtree(corpus_dir)
+        corpus = generate_corpus(corpus_dir, size, args.seed, args.large_lines)
+        if "detectors" in modes:
+            results[f"detectors/{size}"] = bench_detectors(corpus)
+        if "pipeline" in modes:
+            try:
+                results[f"pipeline/{size}"] = bench_pipeline(corpus, args.jobs, args.daemon)
+            except RuntimeError as e:
+                print(f"❌ Сбой проверки в бенчмарке: {e}")
+                return 1
+
+    print("| Замер | N | p50, мс | p95, мс | в секунду | пик RSS, МБ |")
+    print("|-------|---|---------|---------|-----------|-------------|")
+    for key, r in results.items():
+        print(f"| {key} | {r['count']} | {r['p50_ms']} | {r['p95_ms']} | "
+              f"{r['throughput_per_s']} | {r['peak_rss_mb']} |")
+
+    # Параметры наборов входят в эталон: сравнивать можно только одинаковые наборы
+    config = {"seed": args.seed, "large_lines": args.large_lines, "jobs": args.jobs,
+              "daemon": args.daemon}
+    report = {"config": config, "results": results}
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        print(f"💾 Эталон сохранён: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != config:
+            print(f"⚠️ Параметры эталона отличаются: {baseline.get('config')} ≠ {config}")
+        regressions = compare(results, baseline.get("results", {}), args.tolerance,
+                              args.min_delta_ms)
+        if regressions:
+            print(f"\n❌ РЕГРЕССИЯ производительности (допуск {args.tolerance:.0%}):")
+            for regression in regressions:
+                print(f"   - {regression}")
+            return 1
+        print(f"\n✅ Регрессий относительно {args.baseline} нет")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
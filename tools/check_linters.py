@@ -1,105 +1,280 @@
 #!/usr/bin/env python3
 """Проверка линтеров со сбором ВСЕХ ошибок"""
+import asyncio
 import subprocess
 import json
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
 from pathlib import Path
 
-SCRIPTS = [
-    "you_playwright/run_chromium.py",
-    "you_playwright/run_firefox.py",
-    "you_playwright/run_webkit.py",
-    "you_playwright/info_headless.py"
-]
+import analysis_cache
+import diagnostics
+import limits
+import linter_daemon
+import result_cache
+import task_spec
+import timing
+
+TASK = task_spec.load()
+PROJECT_DIR = TASK.project_dir
+SCRIPTS = TASK.scripts
+# Файлы настроек, которые читают flake8 и pylint в каталоге работы
+LINTER_CONFIGS = [".flake8", ".pylintrc", "setup.cfg", "tox.ini", "pyproject.toml"]
+
+def find_missing(root="."):
+    """Список отсутствующих скриптов относительно корня работы"""
+    return [s for s in SCRIPTS if not (Path(root) / s).exists()]
 
 def check_project_exists():
     """Проверка существования папки проекта"""
-    project = Path("you_playwright")
+    project = Path(PROJECT_DIR)
     if not project.exists():
-        print("❌ КРИТИЧЕСКАЯ ОШИБКА: Папка you_playwright не найдена!")
+        print(f"❌ КРИТИЧЕСКАЯ ОШИБКА: Папка {PROJECT_DIR} не найдена!")
         print("   Структура проекта должна быть:")
-        print("   you_playwright/")
-        print("   ├── run_chromium.py")
-        print("   ├── run_firefox.py")
-        print("   ├── run_webkit.py")
-        print("   ├── info_headless.py")
+        print(f"   {PROJECT_DIR}/")
+        for fname in TASK.file_names:
+            print(f"   ├── {fname}")
         print("   └── README.md")
         sys.exit(1)
     
-    missing = [s for s in SCRIPTS if not Path(s).exists()]
+    missing = find_missing()
     if missing:
         print("❌ Отсутствуют файлы:")
         for f in missing:
             print(f"   - {f}")
         sys.exit(1)
 
-def run_flake8():
-    """Запуск flake8 со сбором ВСЕХ ошибок"""
-    result = subprocess.run(
-        ["flake8", "--exit-zero", "--max-line-length=88"] + SCRIPTS,
-        capture_output=True,
-        text=True,
-        timeout=30
-    )
-    errors = [line.strip() for line in result.stdout.strip().splitlines() if line.strip()]
-    error_count = len(errors)
-    score = max(0, 10 - error_count // 2)  # 1 балл за каждые 2 ошибки
-    
-    return score, error_count, errors  # ← ВСЕ ошибки, без обрезки!
+# Демон линтеров (tools/linter_daemon.py) используется, если он запущен
+USE_DAEMON = os.getenv("GRADER_NO_LINTER_DAEMON") is None
+DAEMON_SOCKET = None
+SHARD_TIMEOUT = 30  # секунд на один шард одного линтера
+# Линтеры в текущем процессе (режим наблюдения, tools/watch.py): импорт один раз,
+# запуски по очереди — run_in_process меняет рабочий каталог и stdout процесса
+IN_PROCESS = False
+_in_process_lock = threading.Lock()
 
-def run_pylint():
-    """Запуск pylint со сбором ВСЕХ критических ошибок"""
-    result = subprocess.run(
-        ["pylint", "--exit-zero", "--output-format=text", "--score=no",
-         "--disable=all", "--enable=E,F,C0301,C0303,W0611,W0612"] + SCRIPTS,
-        capture_output=True,
-        text=True,
-        timeout=30
-    )
-    # Ищем ошибки (E:), фатальные (F:) и некоторые предупреждения
-    errors = [
-        line.strip() for line in result.stdout.strip().splitlines()
-        if line.strip() and (
-            line.startswith("E:") or 
-            line.startswith("F:") or 
-            "C030" in line or 
-            "W0611" in line or  # unused-import
-            "W0612" in line     # unused-variable
+def make_shards(files, workers=None):
+    """Разбиение файлов на шарды: по файлу на шард, но не больше, чем ядер
+
+    Линтеры работают одновременно, поэтому каждому достаётся половина ядер.
+    """
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 1) // 2)
+    count = min(len(files), workers)
+    return [files[i::count] for i in range(count)]
+
+def daemon_running():
+    return USE_DAEMON and linter_daemon.is_running(DAEMON_SOCKET)
+
+def single_shard():
+    """Линтеры, обрабатывающие запросы последовательно: шардирование бесполезно"""
+    return IN_PROCESS or daemon_running()
+
+def run_linter(command, files, root="."):
+    """Запуск линтера через демон, а если его нет — отдельным процессом"""
+    if IN_PROCESS:
+        with _in_process_lock, timing.span(f"{command[0]}.in_process"):
+            try:
+                response = linter_daemon.run_in_process(
+                    command[0], command[1:] + files, os.path.abspath(root)
+                )
+            except MemoryError as e:
+                # Бюджет памяти процесса (limits.limit_process) — как у демона
+                response = {"returncode": 1, "stdout": "", "stderr": f"MemoryError: {e}"}
+        return subprocess.CompletedProcess(
+            command + files, response["returncode"], response["stdout"], response["stderr"]
         )
-    ]
-    error_count = len(errors)
-    score = max(0, 10 - error_count)
-    
-    return score, error_count, errors  # ← ВСЕ ошибки, без обрезки!
+    if daemon_running():
+        with timing.span(f"{command[0]}.daemon"):
+            result = linter_daemon.request(
+                command[0], command[1:] + files, root, DAEMON_SOCKET, timeout=SHARD_TIMEOUT
+            )
+        if result is not None:
+            return result
+    with timing.span(f"{command[0]}.subprocess"):
+        return limits.run(command + files, "linters", timeout=SHARD_TIMEOUT, cwd=root)
 
-def main():
-    check_project_exists()
-    
+async def run_linter_async(command, files, root="."):
+    """Запуск линтера подпроцессом без блокировки цикла событий (tools/pipeline.py)
+
+    Демон и линтеры в процессе обслуживают запросы по очереди, поэтому с ними
+    обычный run_linter() выполняется в отдельном потоке.
+    """
+    if single_shard():
+        return await asyncio.to_thread(run_linter, command, files, root)
+    process = await asyncio.create_subprocess_exec(
+        *command, *files,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=root,
+    )
+    limits.apply("linters", process.pid)
     try:
-        flake8_score, flake8_errors, flake8_details = run_flake8()
-    except Exception as e:
-        flake8_score, flake8_errors = 0, 0
-        flake8_details = [f"Ошибка запуска flake8: {e}"]
-    
+        stdout, stderr = await asyncio.wait_for(process.communicate(), SHARD_TIMEOUT)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise subprocess.TimeoutExpired(command + files, SHARD_TIMEOUT)
+    return subprocess.CompletedProcess(
+        command + files, process.returncode,
+        stdout.decode("utf-8", "replace"), stderr.decode("utf-8", "replace")
+    )
+
+def linter_version(tool, command, root="."):
+    """Версия результата линтера: сам инструмент, его аргументы и конфиги работы"""
+    try:
+        tool_version = metadata.version(tool)
+    except metadata.PackageNotFoundError:
+        tool_version = "unknown"
+    return result_cache.checker_version(
+        f"{tool} {tool_version}", " ".join(command),
+        *(Path(root) / name for name in LINTER_CONFIGS)
+    )
+
+# Команды линтеров: вывод в машиночитаемом виде (см. diagnostics.py)
+FLAKE8_COMMAND = ["flake8", "--exit-zero", "--max-line-length=88",
+                  f"--format={diagnostics.FLAKE8_FORMAT}"]
+PYLINT_COMMAND = ["pylint", "--exit-zero", "--output-format=json", "--score=no",
+                  "--disable=all", "--enable=E,F,C0301,C0303,W0611,W0612"]
+
+# (линтер, SHA-256 файла, версия) → замечания по файлу (Diagnostic.as_row())
+_lint_memo = result_cache.MemoryCache()
+
+def lint_scripts(tool, command, root="."):
+    """Линтер для всех файлов задания → список diagnostics.Diagnostic в порядке
+    SCRIPTS (синхронная обёртка над lint_files())"""
+    found = asyncio.run(lint_files(tool, command, SCRIPTS, root))
+    return [d for s in SCRIPTS for d in found[s]]
+
+def shard_rows(tool, shard, result):
+    """Вывод линтера по шарду → {файл: замечания (Diagnostic.as_row())}"""
+    if result.returncode != 0:
+        exceeded = limits.exceeded("linters", result.returncode, result.stderr)
+        if exceeded is not None:
+            raise limits.LimitExceeded(exceeded)
+        raise RuntimeError(result.stderr.strip() or f"код выхода {result.returncode}")
+    by_file = {os.path.normpath(script): [] for script in shard}
+    for diagnostic in diagnostics.PARSERS[tool](result.stdout):
+        rows = by_file.get(os.path.normpath(diagnostic.path))
+        if rows is not None:
+            rows.append(diagnostic.as_row())
+    return {script: by_file[os.path.normpath(script)] for script in shard}
+
+async def lint_files(tool, command, scripts, root="."):
+    """Запуск линтера только для файлов с ещё не проверенным содержимым
+
+    Диагностика хранится по хэшу содержимого из общего кэша разбора: в памяти
+    процесса (одинаковые файлы разных работ в пакетном режиме) и в дисковом
+    кэше результатов (повторные проверки после push). Подпроцессы шардов
+    не блокируют цикл событий: конвейер (tools/pipeline.py) тем временем
+    выполняет остальные этапы. Возвращает {файл: список Diagnostic}.
+    """
+    cache = result_cache.default_cache()
+    version = linter_version(tool, command, root)
+    keys = {s: (tool, analysis_cache.analyze(Path(root) / s).digest, version) for s in scripts}
+    if cache is not None:
+        with timing.span(f"{tool}.cache"):
+            for key in keys.values():
+                if key not in _lint_memo:
+                    rows = cache.get(*key)
+                    if rows is not None:
+                        _lint_memo[key] = rows
+
+    pending = [s for s in scripts if keys[s] not in _lint_memo]
+    if pending:
+        # Шарды идут параллельно: время линтера определяется самым медленным
+        # файлом. Демон и линтеры в процессе работают последовательно, поэтому
+        # им файлы отправляются одним запросом.
+        shards = [pending] if single_shard() else make_shards(pending)
+        results = await asyncio.gather(*(run_linter_async(command, shard, root) for shard in shards))
+        for shard, result in zip(shards, results):
+            for script, rows in shard_rows(tool, shard, result).items():
+                _lint_memo[keys[script]] = rows
+                if cache is not None:
+                    cache.put(*keys[script], rows)
+    return {
+        s: [diagnostics.Diagnostic.from_row(tool, s, row) for row in _lint_memo[keys[s]]]
+        for s in scripts
+    }
+
+def run_flake8(root="."):
+    """Запуск flake8 со сбором ВСЕХ ошибок"""
+    with timing.span("flake8"):
+        return lint_scripts("flake8", FLAKE8_COMMAND, root)
+
+def run_pylint(root="."):
+    """Запуск pylint со сбором ВСЕХ критических ошибок"""
+    with timing.span("pylint"):
+        return lint_scripts("pylint", PYLINT_COMMAND, root)
+
+def _safe_run(tool, runner, root):
+    """Запуск одного линтера: (замечания, None) или (None, текст ошибки запуска)"""
     try:
-        pylint_score, pylint_errors, pylint_details = run_pylint()
+        return runner(root), None
     except Exception as e:
-        pylint_score, pylint_errors = 0, 0
-        pylint_details = [f"Ошибка запуска pylint: {e}"]
-    
-    total = flake8_score + pylint_score
+        return None, launch_error(tool, e)
+
+def launch_error(tool, error):
+    """Текст ошибки запуска линтера для отчёта"""
+    if isinstance(error, limits.LimitExceeded):
+        return f"⛔ {tool}: превышен лимит — {error}"
+    if isinstance(error, subprocess.TimeoutExpired):
+        return f"Ошибка запуска {tool}: превышен таймаут {error.timeout} с"
+    return f"Ошибка запуска {tool}: {error}"
+
+def collect_results(root="."):
+    """Параллельный запуск обоих линтеров для одной работы и сбор результата
+
+    Замечание, которое нашли оба линтера (файл, строка и равнозначный код),
+    засчитывается только flake8. Ошибка запуска линтера даёт 0 баллов.
+    """
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        flake8_future = pool.submit(_safe_run, "flake8", run_flake8, root)
+        pylint_future = pool.submit(_safe_run, "pylint", run_pylint, root)
+        runs = {"flake8": flake8_future.result(), "pylint": pylint_future.result()}
+    return summarize(runs)
+
+def summarize(runs):
+    """{линтер: (замечания, ошибка запуска)} → словарь linters_result.json"""
+    results = {}
+    seen = set()
+    for tool, (found, error) in runs.items():
+        if error is not None:
+            score, count, details = 0, 0, [error]
+        else:
+            found = diagnostics.dedupe(diagnostics.scored(found), seen)
+            score = diagnostics.score(found)
+            details = [str(d) for d in found]  # ← Полный список
+            count = len(found)
+        results[f"{tool}_score"] = score
+        results[f"{tool}_errors"] = count
+        results[f"{tool}_details"] = details
+    results["total"] = results["flake8_score"] + results["pylint_score"]
+    return results
+
+def save_results(results, path="linters_result.json"):
+    """Сохранение ВСЕХ ошибок для отчёта"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+def main():
+    with timing.span("structure"):
+        check_project_exists()
     
-    # Сохраняем ВСЕ ошибки для отчёта
-    with open("linters_result.json", "w", encoding="utf-8") as f:
-        json.dump({
-            "flake8_score": flake8_score,
-            "flake8_errors": flake8_errors,
-            "flake8_details": flake8_details,  # ← Полный список
-            "pylint_score": pylint_score,
-            "pylint_errors": pylint_errors,
-            "pylint_details": pylint_details,  # ← Полный список
-            "total": total
-        }, f, ensure_ascii=False, indent=2)
+    with timing.span("linters"):
+        results = collect_results()
+    save_results(results)
+    timing.timings.save("check_linters")
+    flake8_score = results["flake8_score"]
+    flake8_errors = results["flake8_errors"]
+    flake8_details = results["flake8_details"]
+    pylint_score = results["pylint_score"]
+    pylint_errors = results["pylint_errors"]
+    pylint_details = results["pylint_details"]
+    total = results["total"]
     
     # Вывод в консоль — все ошибки (но не более 25 для читаемости)
     print("🔍 Результаты flake8:")
@@ -126,5 +301,5 @@ if __name__ == "__main__":
         sys.exit(main())
     except FileNotFoundError as e:
         print(f"❌ Ошибка: {e}")
-        print("   Убедитесь, что все файлы находятся в папке you_playwright/")
+        print(f"   Убедитесь, что все файлы находятся в папке {PROJECT_DIR}/")
         sys.exit(1)
\ No newline at end of file
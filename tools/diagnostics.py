@@ -0,0 +1,124 @@
+"""Замечания линтеров как записи, а не строки вывода
+
+flake8 запускается с форматом полей через табуляцию, pylint — с JSON-отчётом;
+оба разбираются в записи Diagnostic. Баллы считаются по таблице весов кодов,
+а одно и то же замечание, найденное обоими линтерами (неиспользуемый импорт,
+длинная строка), засчитывается один раз — по ключу (файл, строка, код).
+"""
+import json
+import math
+
+# Формат вывода flake8: поля через табуляцию (в сообщениях её не бывает)
+FLAKE8_FORMAT = "\t".join(["%(path)s", "%(row)d", "%(col)d", "%(code)s", "%(text)s"])
+
+# Вес замечания в баллах: точный код или префикс (берётся самый длинный);
+# замечания с весом 0 в отчёт не попадают
+WEIGHTS = {
+    # 1 балл за каждые 2 замечания
+    "flake8": {"": 0.5},
+    # ошибки, фатальные ошибки и отдельные предупреждения — по баллу
+    "pylint": {
+        "": 0.0,
+        "E": 1.0,
+        "F": 1.0,
+        "C0301": 1.0,  # line-too-long
+        "C0303": 1.0,  # trailing-whitespace
+        "W0611": 1.0,  # unused-import
+        "W0612": 1.0,  # unused-variable
+    },
+}
+MAX_SCORE = 10
+
+# Коды pylint, совпадающие по смыслу с кодами flake8 (для удаления дублей)
+EQUIVALENT = {
+    "C0301": "E501",  # line-too-long
+    "C0303": "W291",  # trailing-whitespace
+    "W0611": "F401",  # unused-import
+    "W0612": "F841",  # unused-variable
+    "E0602": "F821",  # undefined-variable
+    "E0001": "E999",  # syntax-error
+}
+
+class Diagnostic:
+    """Одно замечание линтера"""
+    __slots__ = ("tool", "path", "line", "column", "code", "message")
+
+    def __init__(self, tool, path, line, column, code, message):
+        self.tool = tool
+        self.path = path
+        self.line = line
+        self.column = column
+        self.code = code
+        self.message = message
+
+    @property
+    def key(self):
+        """Ключ для удаления дублей между линтерами"""
+        return (self.path, self.line, EQUIVALENT.get(self.code, self.code))
+
+    def as_row(self):
+        """Поля без пути — для кэша результатов по содержимому файла"""
+        return [self.line, self.column, self.code, self.message]
+
+    @classmethod
+    def from_row(cls, tool, path, row):
+        return cls(tool, path, *row)
+
+    def __str__(self):
+        # Строка в привычном формате вывода самого линтера
+        if self.tool == "pylint":
+            return f"{self.path}:{self.line}:{self.column}: {self.code}: {self.message}"
+        return f"{self.path}:{self.line}:{self.column}: {self.code} {self.message}"
+
+def parse_flake8(stdout):
+    """Вывод flake8 в формате FLAKE8_FORMAT → список Diagnostic"""
+    diagnostics = []
+    for line in stdout.splitlines():
+        parts = line.split("\t", 4)
+        if len(parts) != 5:
+            continue
+        path, row, col, code, text = parts
+        diagnostics.append(Diagnostic("flake8", path, int(row), int(col), code, text))
+    return diagnostics
+
+def parse_pylint(stdout):
+    """JSON-отчёт pylint → список Diagnostic (сообщение — с символьным именем)"""
+    if not stdout.strip():
+        return []
+    return [
+        Diagnostic("pylint", item["path"], item["line"], item["column"], item["message-id"],
+                   f"{item['message']} ({item['symbol']})")
+        for item in json.loads(stdout)
+    ]
+
+PARSERS = {"flake8": parse_flake8, "pylint": parse_pylint}
+
+_weights = {}  # (линтер, код) → вес
+
+def weight(tool, code):
+    """Вес кода по самому длинному совпавшему префиксу из WEIGHTS"""
+    cached = _weights.get((tool, code))
+    if cached is None:
+        table = WEIGHTS[tool]
+        prefix = max((p for p in table if code.startswith(p)), key=len)
+        cached = _weights[(tool, code)] = table[prefix]
+    return cached
+
+def scored(diagnostics):
+    """Только замечания с ненулевым весом"""
+    return [d for d in diagnostics if weight(d.tool, d.code) > 0]
+
+def dedupe(diagnostics, seen):
+    """Удаление замечаний, уже учтённых другим линтером (ключи в seen)
+
+    Замечания одного линтера не схлопываются между собой: два неиспользуемых
+    импорта в одной строке — два замечания. Ключи оставшихся добавляются в seen.
+    """
+    unique = [d for d in diagnostics if d.key not in seen]
+    seen.update(d.key for d in unique)
+    return unique
+
+def score(diagnostics):
+    """Баллы из MAX_SCORE за вычетом весов замечаний"""
+    penalty = sum(weight(d.tool, d.code) for d in diagnostics)
+    return max(0, MAX_SCORE - math.floor(penalty))
@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""Локальный сервис проверки работ с очередью заданий
+
+Вместо отдельного задания Actions на каждый push работы присылаются по HTTP
+(TCP на localhost или Unix-сокет): архивом .tar/.tar.gz или путём к каталогу
+работы. Задания попадают в ограниченную очередь; фиксированный пул процессов
+проверяет их тем же ядром, что generate_summary.py (report.collect), с уже
+импортированными и прогретыми flake8/pylint (check_linters.IN_PROCESS) и
+загруженными тестами синтаксиса. Переполненная очередь отвечает 503.
+
+    POST /grade              — тело: архив или {"path": "/каталог/работы"}
+         ?wait=0             — не ждать результата: 202 и адрес задания
+         ?format=markdown    — отчёт Markdown вместо JSON
+    GET  /jobs/<id>          — состояние и результат задания
+    GET  /metrics            — глубина очереди, задержки этапов, пропускная способность
+    GET  /health
+
+    python tools/grading_server.py serve --port 8765 -j 4
+    python tools/grading_server.py serve --socket /tmp/grader.sock
+    python tools/grading_server.py submit path/to/work [--format markdown]
+    python tools/grading_server.py submit work.tar.gz --url http://127.0.0.1:8765
+    python tools/grading_server.py metrics
+"""
+import argparse
+import http.client
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import signal
+import socket
+import socketserver
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import analysis_cache
+import check_linters
+import limits
+import linter_daemon
+import report
+import result_cache
+import syntax_runner
+import timing
+
+HOST = "127.0.0.1"
+PORT = 8765
+QUEUE_SIZE = 64               # заданий в очереди, сверх — 503
+JOB_TIMEOUT = 300             # секунд ожидания результата одного задания
+MAX_UPLOAD = 16 * 1024 * 1024  # байт архива в запросе
+MAX_EXTRACT = 64 * 1024 * 1024  # байт файлов после распаковки архива
+KEEP_JOBS = 1000              # завершённых заданий хранится для GET /jobs/<id>
+LATENCY_SAMPLES = 1000        # последних замеров на этап для перцентилей
+
+# === ПРОЦЕСС ПУЛА ===
+
+def _init_worker(pid):
+    """Прогрев процесса пула: линтеры в процессе, тесты синтаксиса загружены
+
+    Линтеры работают в самом процессе пула, поэтому бюджет памяти линтеров
+    действует на весь процесс; время ограничено JOB_TIMEOUT. PID процесса
+    сообщается в pid: зависший процесс убивается по нему (Worker.stop).
+    """
+    pid.value = os.getpid()
+    limits.limit_process("linters")
+    check_linters.IN_PROCESS = True
+    timing.timings.enabled = True
+    linter_daemon.warm_up()
+    syntax_runner.load_syntax_tests()
+
+def grade_job(root, stages):
+    """Проверка одной работы в процессе пула → отчёт в JSON и Markdown с замерами"""
+    timing.timings.reset()
+    started = time.perf_counter()
+    try:
+        result = report.collect(root, stages)
+    finally:
+        # Кэши по пути держат временные каталоги работ: процесс живёт долго,
+        # поэтому записи проверенной работы удаляются (кэши по хэшу ограничены)
+        analysis_cache.forget(root)
+        result_cache.forget(root)
+    markdown = io.StringIO()
+    report.render_markdown(result, markdown)
+    return {
+        "report": result.as_dict(),
+        "markdown": markdown.getvalue(),
+        "exit_code": result.exit_code,
+        "stages": timing.timings.as_dict(),
+        "seconds": time.perf_counter() - started,
+    }
+
+class Worker:
+    """Пул из одного процесса проверки и PID этого процесса"""
+    __slots__ = ("pid", "pool")
+
+    def __init__(self):
+        self.pid = multiprocessing.RawValue("i", 0)
+        self.pool = ProcessPoolExecutor(1, initializer=_init_worker, initargs=(self.pid,))
+
+    def stop(self):
+        """Остановка пула с зависшим заданием: процесс убивается, а не дожидается"""
+        if not self.pid.value:
+            # Процесс ещё не запущен: ждать нечего
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            return
+        try:
+            os.kill(self.pid.value, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+# === ЗАДАНИЯ И МЕТРИКИ ===
+
+class Job:
+    """Работа в очереди: каталог, время этапов жизни и результат"""
+    __slots__ = ("id", "root", "cleanup", "status", "submitted", "started", "finished",
+                 "result", "error", "done")
+
+    def __init__(self, job_id, root, cleanup=None):
+        self.id = job_id
+        self.root = root
+        self.cleanup = cleanup  # временный каталог распакованного архива
+        self.status = "queued"
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+    def as_dict(self):
+        data = {"id": self.id, "status": self.status}
+        if self.started is not None:
+            data["queue_ms"] = round((self.started - self.submitted) * 1000, 1)
+        if self.finished is not None:
+            data["seconds"] = round(self.finished - self.submitted, 3)
+        if self.result is not None:
+            data["exit_code"] = self.result["exit_code"]
+            data["report"] = self.result["report"]
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class Metrics:
+    """Счётчики заданий, задержки этапов и пропускная способность (потокобезопасно)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.counters = {"accepted": 0, "rejected": 0, "completed": 0, "failed": 0}
+        self.latency = {}                         # этап → последние замеры, мс
+        self.finished = deque(maxlen=LATENCY_SAMPLES)  # время завершения заданий
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def observe(self, stage, ms):
+        with self.lock:
+            self.latency.setdefault(stage, deque(maxlen=LATENCY_SAMPLES)).append(ms)
+
+    def job_finished(self, job, stages):
+        """Учёт завершённого задания: ожидание в очереди, этапы и полное время"""
+        with self.lock:
+            self.counters["completed" if job.status == "done" else "failed"] += 1
+            self.finished.append(job.finished)
+        self.observe("queue", (job.started - job.submitted) * 1000)
+        self.observe("total", (job.finished - job.submitted) * 1000)
+        for name, entry in (stages or {}).items():
+            self.observe(name, entry["total_ms"])
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self.lock:
+            uptime = now - self.started
+            recent = sum(1 for moment in self.finished if now - moment <= 60)
+            latency = {}
+            for stage, samples in sorted(self.latency.items()):
+                ordered = sorted(samples)
+                latency[stage] = {
+                    "count": len(ordered),
+                    "mean": round(sum(ordered) / len(ordered), 1),
+                    "p50": round(_percentile(ordered, 0.5), 1),
+                    "p95": round(_percentile(ordered, 0.95), 1),
+                    "max": round(ordered[-1], 1),
+                }
+            done = self.counters["completed"] + self.counters["failed"]
+            return {
+                "uptime_s": round(uptime, 1),
+                "jobs": dict(self.counters),
+                "throughput": {
+                    "per_second": round(done / uptime, 3) if uptime else 0.0,
+                    "last_minute_per_second": round(recent / min(60.0, uptime or 1.0), 3),
+                },
+                "latency_ms": latency,
+            }
+
+# === СЕРВИС ===
+
+class GradingService:
+    """Ограниченная очередь и фиксированный пул прогретых процессов проверки"""
+
+    def __init__(self, workers=None, queue_size=QUEUE_SIZE, stages=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.stages = report.STAGES if stages is None else stages
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.metrics = Metrics()
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.running = 0
+        self.ids = itertools.count(1)
+        # У каждого диспетчера свой процесс проверки: заданий в работе не больше,
+        # чем процессов, остальные ждут в ограниченной очереди, а зависший
+        # процесс заменяется, не задевая задания других диспетчеров
+        self.pools = [Worker() for _ in range(self.workers)]
+        self.dispatchers = [
+            threading.Thread(target=self._dispatch, args=(i,), name=f"dispatch-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self.dispatchers:
+            thread.start()
+
+    def submit(self, root, cleanup=None):
+        """Постановка работы в очередь; None, если очередь заполнена"""
+        job = Job(f"{next(self.ids):06d}", root, cleanup)
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            self.metrics.count("rejected")
+            if cleanup:
+                shutil.rmtree(cleanup, ignore_errors=True)
+            return None
+        self.metrics.count("accepted")
+        with self.lock:
+            self.jobs[job.id] = job
+            self._forget_finished()
+        return job
+
+    def _forget_finished(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.done.is_set()]
+        for job_id in finished[:max(0, len(finished) - KEEP_JOBS)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def _dispatch(self, index):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            job.status = "running"
+            job.started = time.monotonic()
+            with self.lock:
+                self.running += 1
+            try:
+                job.result = self._grade(job, index)
+                job.status = "done"
+            except Exception as e:
+                job.error = f"{type(e).__name__}: {e}"
+                job.status = "failed"
+            finally:
+                job.finished = time.monotonic()
+                with self.lock:
+                    self.running -= 1
+                if job.cleanup:
+                    shutil.rmtree(job.cleanup, ignore_errors=True)
+                self.metrics.job_finished(job, job.result and job.result["stages"])
+                job.done.set()
+
+    def _grade(self, job, index):
+        worker = self.pools[index]
+        future = worker.pool.submit(grade_job, job.root, self.stages)
+        try:
+            return future.result(timeout=JOB_TIMEOUT)
+        except FutureTimeout:
+            # Зависшее задание занимало бы процесс навсегда: процесс убивается
+            # (каталог работы удаляется уже после его остановки), пул пересоздаётся
+            worker.stop()
+            self.pools[index] = Worker()
+            raise TimeoutError(f"проверка дольше {JOB_TIMEOUT} с") from None
+        except BrokenProcessPool:
+            # Процесс пула погиб (например, убит ядром): пул пересоздаётся
+            worker.pool.shutdown(wait=True)
+            self.pools[index] = Worker()
+            raise
+
+    def snapshot(self):
+        data = self.metrics.snapshot()
+        with self.lock:
+            running = self.running
+        data["queue"] = {"depth": self.queue.qsize(), "capacity": self.queue.maxsize,
+                         "running": running, "workers": self.workers}
+        return data
+
+    def close(self):
+        for _ in self.dispatchers:
+            self.queue.put(None)
+        for worker in self.pools:
+            worker.pool.shutdown(wait=False, cancel_futures=True)
+
+def submission_root(directory):
+    """Каталог работы в распакованном архиве: сам каталог или единственная
+    вложенная папка с you_playwright/ (архив репозитория)"""
+    directory = Path(directory)
+    if (directory / report.PROJECT).is_dir():
+        return directory
+    entries = [entry for entry in directory.iterdir() if entry.is_dir()]
+    if len(entries) == 1 and (entries[0] / report.PROJECT).is_dir():
+        return entries[0]
+    return directory
+
+def _checked_members(archive):
+    """Элементы архива без фильтра "data": только файлы и каталоги внутри
+    каталога распаковки; ссылки, устройства, абсолютные пути и .. — ValueError"""
+    members = archive.getmembers()
+    for member in members:
+        path = Path(member.name)
+        if not (member.isfile() or member.isdir()):
+            raise ValueError(f"недопустимый элемент архива: {member.name}")
+        if path.is_absolute() or ".." in path.parts:
+            raise ValueError(f"путь вне каталога работы: {member.name}")
+        member.mode = (member.mode | 0o600) & 0o755
+    return members
+
+def unpack(data):
+    """Архив .tar/.tar.gz → (каталог работы, временный каталог для удаления)
+
+    ValueError — архив не читается, распакованные файлы больше MAX_EXTRACT
+    или в архиве есть элементы вне каталога работы.
+    """
+    try:
+        archive = tarfile.open(fileobj=io.BytesIO(data), mode="r:*")
+    except tarfile.TarError as e:
+        raise ValueError(f"архив не читается: {e}")
+    with archive:
+        if sum(member.size for member in archive.getmembers()) > MAX_EXTRACT:
+            raise ValueError(f"распакованный архив больше {MAX_EXTRACT >> 20} МиБ")
+        # Python до 3.11.4 без фильтров извлечения: элементы проверяются вручную
+        members = None if hasattr(tarfile, "data_filter") else _checked_members(archive)
+        directory = tempfile.mkdtemp(prefix="grader-job-")
+        try:
+            if members is None:
+                archive.extractall(directory, filter="data")
+            else:
+                archive.extractall(directory, members=members)
+        except (tarfile.TarError, OSError) as e:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise ValueError(f"архив не распакован: {e}")
+    return str(submission_root(directory)), directory
+
+# === HTTP ===
+
+class GradingHandler(BaseHTTPRequestHandler):
+    server_version = "playwright-grader/1"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        if url.path == "/health":
+            self._json(200, {"status": "ok"})
+        elif url.path == "/metrics":
+            self._json(200, self.service.snapshot())
+        elif url.path.startswith("/jobs/"):
+            job = self.service.get(url.path[len("/jobs/"):])
+            if job is None:
+                self._json(404, {"error": "задание не найдено"})
+            else:
+                self._job(job, params)
+        else:
+            self._json(404, {"error": "нет такого адреса"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        if url.path != "/grade":
+            self._json(404, {"error": "нет такого адреса"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_UPLOAD:
+            self._json(413, {"error": f"запрос больше {MAX_UPLOAD >> 20} МиБ"})
+            return
+        body = self.rfile.read(length)
+
+        cleanup = None
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            try:
+                root = os.path.abspath(json.loads(body)["path"])
+            except (ValueError, KeyError, TypeError):
+                self._json(400, {"error": "ожидается {\"path\": \"каталог работы\"}"})
+                return
+            if not os.path.isdir(root):
+                self._json(400, {"error": f"каталог не найден: {root}"})
+                return
+        else:
+            try:
+                root, cleanup = unpack(body)
+            except ValueError as e:
+                self._json(400, {"error": str(e)})
+                return
+
+        job = self.service.submit(root, cleanup)
+        if job is None:
+            self._json(503, {"error": "очередь заполнена"}, {"Retry-After": "5"})
+            return
+        if params.get("wait", ["1"])[0] == "0":
+            self._json(202, {"id": job.id, "status": job.status, "url": f"/jobs/{job.id}"})
+            return
+        job.done.wait(JOB_TIMEOUT)
+        self._job(job, params)
+
+    def _job(self, job, params):
+        if params.get("format", ["json"])[0] == "markdown" and job.result is not None:
+            self._send(200, "text/markdown", job.result["markdown"])
+            return
+        status = {"done": 200, "failed": 500}.get(job.status, 202)
+        self._json(status, job.as_dict())
+
+    def _json(self, status, data, headers=None):
+        self._send(status, "application/json", json.dumps(data, ensure_ascii=False), headers)
+
+    def _send(self, status, content_type, body, headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *_):
+        pass
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP поверх Unix-сокета (доступ только у пользователей с правами на файл)"""
+    daemon_threads = True
+
+def serve(host=HOST, port=PORT, socket_path=None, workers=None, queue_size=QUEUE_SIZE,
+          stages=None):
+    service = GradingService(workers, queue_size, stages)
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = UnixHTTPServer(socket_path, GradingHandler)
+        where = socket_path
+    else:
+        server = ThreadingHTTPServer((host, port), GradingHandler)
+        where = f"http://{host}:{server.server_address[1]}"
+    server.service = service
+    print(f"🧪 Сервис проверки: {where} (процессов: {service.workers}, "
+          f"очередь: {queue_size})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+# === КЛИЕНТ ===
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=JOB_TIMEOUT):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+def _request(method, path, body=None, headers=None, url=None, socket_path=None):
+    if socket_path:
+        connection = UnixHTTPConnection(socket_path)
+    else:
+        parts = urlsplit(url or f"http://{HOST}:{PORT}")
+        connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=JOB_TIMEOUT)
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, response.read().decode("utf-8")
+    finally:
+        connection.close()
+
+def submit(target, url=None, socket_path=None, fmt="json", wait=True):
+    """Отправка работы (каталог — путём, файл — архивом) → (HTTP-статус, тело ответа)"""
+    if os.path.isdir(target):
+        body = json.dumps({"path": os.path.abspath(target)}).encode("utf-8")
+        content_type = "application/json"
+    else:
+        with open(target, "rb") as f:
+            body = f.read()
+        content_type = "application/gzip" if target.endswith("gz") else "application/x-tar"
+    query = f"/grade?format={fmt}" + ("" if wait else "&wait=0")
+    return _request("POST", query, body, {"Content-Type": content_type}, url, socket_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный сервис проверки работ")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="запустить сервис")
+    serve_parser.add_argument("--host", default=HOST)
+    serve_parser.add_argument("--port", type=int, default=PORT)
+    serve_parser.add_argument("-j", "--jobs", type=int, default=None, help="процессов проверки")
+    serve_parser.add_argument("--queue", type=int, default=QUEUE_SIZE, help="размер очереди")
+    serve_parser.add_argument("--stages", default=None, help="этапы через запятую")
+    submit_parser = sub.add_parser("submit", help="отправить работу на проверку")
+    submit_parser.add_argument("target", help="каталог работы или архив .tar/.tar.gz")
+    submit_parser.add_argument("--format", choices=["json", "markdown"], default="json")
+    submit_parser.add_argument("--no-wait", action="store_true", help="не ждать результата")
+    sub.add_parser("metrics", help="метрики сервиса")
+    serve_parser.add_argument("--socket", default=None, help="Unix-сокет вместо TCP")
+    for command in (submit_parser, sub.choices["metrics"]):
+        command.add_argument("--url", default=None, help=f"адрес сервиса (http://{HOST}:{PORT})")
+        command.add_argument("--socket", default=None, help="Unix-сокет вместо TCP")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        stages = [s.strip() for s in args.stages.split(",")] if args.stages else None
+        serve(args.host, args.port, args.socket, args.jobs, args.queue, stages)
+        return 0
+    if args.command == "submit":
+        status, body = submit(args.target, args.url, args.socket, args.format, not args.no_wait)
+    else:
+        status, body = _request("GET", "/metrics", url=args.url, socket_path=args.socket)
+    print(body)
+    return 0 if status < 400 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Инкрементальная проверка по истории git
+
+После проверки запоминаются коммит и результаты каждого файла задания.
+При следующей проверке `git diff --name-only <коммит>` показывает, какие
+файлы изменились: только они проходят этапы заново, результаты остальных
+берутся из сохранённого состояния. Push «исправил один файл» проверяет
+один файл.
+
+Состояние лежит в каталоге кэша результатов (GRADER_CACHE_DIR, в CI его
+переносит между запусками actions/cache) и не используется, если изменились
+проверяющий код, описание задания, конфиги линтеров, лимиты или набор
+этапов. Если прошлого коммита нет в клоне, git недоступен или каталог — не
+репозиторий, работа проверяется целиком. Включается GRADER_INCREMENTAL=1.
+
+    GRADER_INCREMENTAL=1 python tools/incremental.py [каталог работы]
+"""
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import check_linters
+import limits
+import pipeline
+import report
+import result_cache
+import syntax_runner
+import task_spec
+
+ENABLED = bool(os.getenv("GRADER_INCREMENTAL"))
+STATE_DIR = os.path.join(result_cache.CACHE_DIR, "state")
+GIT_TIMEOUT = 30
+
+def git(root, *args):
+    """Вывод команды git в каталоге root или None, если она не удалась"""
+    try:
+        result = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True,
+                                timeout=GIT_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+def head_commit(root="."):
+    output = git(root, "rev-parse", "--verify", "HEAD")
+    return output.strip() if output else None
+
+def changed_files(root, commit):
+    """Имена файлов задания, изменённых после commit (с незакоммиченными
+    и новыми файлами), или None, если сравнить нельзя"""
+    diff = git(root, "diff", "--name-only", "--relative", commit, "--", report.PROJECT)
+    untracked = git(root, "ls-files", "--others", "--exclude-standard", "--", report.PROJECT)
+    if diff is None or untracked is None:
+        return None
+    return {Path(path).name for path in diff.splitlines() + untracked.splitlines()}
+
+def is_clean(root="."):
+    """Совпадает ли папка задания с HEAD (только тогда результаты относятся к коммиту)"""
+    status = git(root, "status", "--porcelain", "--", report.PROJECT)
+    return status is not None and not status.strip()
+
+def grader_version(root, stages):
+    """Версия проверки: код tools/, тесты, задание, конфиги линтеров, лимиты, этапы"""
+    tools_dir = Path(__file__).resolve().parent
+    budget = limits.BUDGETS["linters"]
+    return result_cache.checker_version(
+        *sorted(tools_dir.glob("*.py")), syntax_runner.SYNTAX_TESTS, task_spec.load().path,
+        *(Path(root) / name for name in check_linters.LINTER_CONFIGS),
+        f"{limits.MAX_FILE_BYTES} {budget.cpu} {budget.memory}", ",".join(stages),
+    )
+
+def state_path(root):
+    key = hashlib.sha256(os.path.abspath(root).encode("utf-8")).hexdigest()[:16]
+    return Path(STATE_DIR) / f"{key}.json"
+
+def load_state(root):
+    try:
+        with open(state_path(root), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def save_state(root, state):
+    path = state_path(root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def previous_results(root, version):
+    """Сохранённые результаты файлов, не изменившихся с проверенного коммита"""
+    state = load_state(root)
+    if not state or state.get("version") != version:
+        return None
+    changed = changed_files(root, state["commit"])
+    if changed is None:
+        return None
+    return {fname: data for fname, data in state["files"].items() if fname not in changed}
+
+def grade(root=".", stages=None):
+    """Проверка работы с повторным использованием результатов неизменённых файлов
+    → pipeline.Grading (без GRADER_INCREMENTAL — обычная полная проверка)"""
+    stages = report.STAGES if stages is None else stages
+    if not ENABLED or result_cache.default_cache() is None:
+        return pipeline.run(root, stages)
+
+    version = grader_version(root, stages)
+    grading = pipeline.run(root, stages, previous_results(root, version))
+    if grading.reused:
+        print(f"♻️ Без изменений с прошлой проверки: {', '.join(grading.reused)}")
+
+    commit = head_commit(root)
+    if commit and is_clean(root):
+        save_state(root, {"commit": commit, "version": version, "files": grading.files})
+    return grading
+
+def main():
+    root = sys.argv[1] if len(sys.argv) > 1 else "."
+    result = grade(root).report()
+    report.render_markdown(result, sys.stdout)
+    return result.exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
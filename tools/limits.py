@@ -0,0 +1,142 @@
+"""Бюджеты ресурсов этапов проверки
+
+Сгенерированный скрипт на 50 тысяч строк или выражение с тысячами уровней
+вложенности не должны останавливать весь CI или пакетную проверку группы:
+
+- файл больше MAX_FILE_BYTES не читается, не разбирается и не отдаётся
+  линтерам (размер проверяется по stat до чтения);
+- подпроцессам линтеров и этапа запуска ограничиваются процессорное время
+  и память: prlimit сразу после запуска (preexec_fn небезопасен, когда
+  в процессе работают потоки, а подпроцессы запускаются из потоков
+  и цикла событий);
+- линтеры в долгоживущем процессе (демон, IN_PROCESS в процессах пула
+  grading_server.py) получают только бюджет памяти на весь процесс
+  (limit_process): время процессора копится за все запросы, поэтому его
+  ограничивают таймауты запросов и заданий, а зависший процесс пула
+  сервис заменяет новым;
+- сработавший лимит превращается в результат «превышен лимит» для этого
+  файла или этапа, а проверка продолжается.
+
+Переменные окружения (0 — без ограничения):
+    GRADER_MAX_FILE_BYTES  — размер файла задания (по умолчанию 256 КиБ)
+    GRADER_LINTER_CPU      — секунд процессора на подпроцесс линтера (20)
+    GRADER_LINTER_MEMORY   — байт адресного пространства линтера (1 ГиБ)
+    GRADER_RUNTIME_CPU     — секунд процессора на процесс этапа запуска (120)
+"""
+import os
+import signal
+import subprocess
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: ограничения подпроцессов недоступны
+    resource = None
+
+def _env(name, default):
+    return int(os.getenv(name, str(default))) or None
+
+MAX_FILE_BYTES = _env("GRADER_MAX_FILE_BYTES", 256 * 1024)
+
+class Budget:
+    """Ограничения подпроцесса этапа: секунды процессора и байты памяти"""
+    __slots__ = ("cpu", "memory")
+
+    def __init__(self, cpu=None, memory=None):
+        self.cpu = cpu
+        self.memory = memory
+
+BUDGETS = {
+    "linters": Budget(_env("GRADER_LINTER_CPU", 20), _env("GRADER_LINTER_MEMORY", 1 << 30)),
+    # Браузеры резервируют гигабайты адресного пространства: только время процессора
+    "runtime": Budget(_env("GRADER_RUNTIME_CPU", 120)),
+}
+
+class LimitExceeded(Exception):
+    """Этап остановлен бюджетом ресурсов"""
+
+class FileTooLarge(LimitExceeded, OSError):
+    """Файл больше MAX_FILE_BYTES (для кода, ждущего OSError, — нечитаемый файл)"""
+
+class NestingTooDeep(LimitExceeded, SyntaxError):
+    """Разбор файла исчерпал стек или память парсера
+
+    Наследует SyntaxError: для кода, который ждёт только ошибки разбора,
+    такой файл просто не разбирается.
+    """
+
+def oversized(path, size=None):
+    """Сообщение о превышении размера файла или None (size — если уже известен)"""
+    if MAX_FILE_BYTES is None:
+        return None
+    if size is None:
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            return None
+    if size <= MAX_FILE_BYTES:
+        return None
+    return f"{Path(path).name}: {size // 1024} КиБ при лимите {MAX_FILE_BYTES // 1024} КиБ"
+
+def _bounded(value, hard):
+    return value if hard == resource.RLIM_INFINITY else min(value, hard)
+
+def rlimits(stage):
+    """[(ресурс, (мягкий, жёсткий))] бюджета этапа
+
+    Без ограничения ресурса мягкий лимит поднимается до жёсткого: подпроцесс
+    не наследует бюджет памяти процесса, который его запустил (limit_process).
+    """
+    budget = BUDGETS[stage]
+    found = []
+    for rlimit, value, extra in ((resource.RLIMIT_CPU, budget.cpu, 1),
+                                 (resource.RLIMIT_AS, budget.memory, 0)):
+        hard = resource.getrlimit(rlimit)[1]
+        if value is None:
+            found.append((rlimit, (hard, hard)))
+        else:
+            # Мягкий лимит времени присылает SIGXCPU, жёсткий секундой позже — SIGKILL
+            found.append((rlimit, (_bounded(value, hard), _bounded(value + extra, hard))))
+    return found
+
+def apply(stage, pid):
+    """Бюджет этапа для запущенного подпроцесса (prlimit; вне Linux — без ограничений)"""
+    if resource is None or not hasattr(resource, "prlimit"):
+        return
+    for rlimit, value in rlimits(stage):
+        try:
+            resource.prlimit(pid, rlimit, value)
+        except ProcessLookupError:  # подпроцесс уже завершился
+            return
+
+def limit_process(stage):
+    """Бюджет памяти этапа для текущего долгоживущего процесса (мягкий лимит)"""
+    budget = BUDGETS[stage]
+    if resource is None or budget.memory is None:
+        return
+    hard = resource.getrlimit(resource.RLIMIT_AS)[1]
+    resource.setrlimit(resource.RLIMIT_AS, (_bounded(budget.memory, hard), hard))
+
+def run(command, stage, timeout=None, **kwargs):
+    """subprocess.run(capture_output=True, text=True) с бюджетом этапа"""
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          text=True, **kwargs) as process:
+        apply(stage, process.pid)
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+def exceeded(stage, returncode, stderr=""):
+    """Какой лимит сработал у завершившегося подпроцесса: сообщение или None"""
+    if resource is None or returncode == 0:
+        return None
+    budget = BUDGETS[stage]
+    if budget.cpu is not None and returncode in (-signal.SIGXCPU, -signal.SIGKILL):
+        return f"процессорное время больше {budget.cpu} с"
+    if budget.memory is not None and "MemoryError" in (stderr or ""):
+        return f"память больше {budget.memory >> 20} МиБ"
+    return None
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""Долгоживущий процесс с загруженными flake8 и pylint
+
+Запуск pylint — это в основном импорт самого pylint и astroid, а не проверка
+четырёх маленьких файлов. Демон импортирует линтеры один раз и принимает
+запросы через Unix-сокет: одна JSON-строка запроса — одна JSON-строка ответа.
+
+    {"tool": "pylint", "args": [...], "cwd": "/path/to/work"}
+    → {"returncode": 0, "stdout": "...", "stderr": ""}
+
+    python tools/linter_daemon.py serve              # запуск демона
+    python tools/linter_daemon.py bench path/to/work # сравнение задержки
+
+check_linters.py использует демон, если сокет доступен, иначе запускает
+линтеры отдельными процессами, как раньше.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import limits
+
+SOCKET_PATH = os.getenv(
+    "GRADER_LINTER_SOCKET",
+    os.path.join(tempfile.gettempdir(), "grader-linters.sock"),
+)
+
+def is_running(socket_path=None):
+    """Есть ли сокет запущенного демона"""
+    return os.path.exists(socket_path or SOCKET_PATH)
+
+def request(tool, args, cwd=".", socket_path=None, timeout=30):
+    """Запрос к демону; None, если демон не запущен, не ответил за timeout
+    или оборвал соединение — тогда линтер запускается обычным подпроцессом
+
+    Ответ возвращается как subprocess.CompletedProcess, чтобы вызывающий код
+    одинаково обрабатывал демон и обычный подпроцесс.
+    """
+    path = socket_path or SOCKET_PATH
+    if not is_running(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            payload = {"tool": tool, "args": list(args), "cwd": os.path.abspath(cwd)}
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                line = stream.readline()
+    except OSError:  # в том числе socket.timeout и обрыв соединения
+        return None
+    try:
+        response = json.loads(line)
+    except ValueError:  # пустой или оборванный ответ
+        return None
+    return subprocess.CompletedProcess(
+        [tool] + list(args), response["returncode"], response["stdout"], response["stderr"]
+    )
+
+# === Сторона демона ===
+
+def _forget_user_modules():
+    """Удаление из кэша astroid всех модулей вне stdlib/site-packages
+
+    Иначе pylint увидит прошлую версию файла или файл другого студента
+    с тем же именем модуля.
+    """
+    from astroid import MANAGER
+    prefixes = tuple({os.path.realpath(sys.prefix), os.path.realpath(sys.base_prefix)})
+    for name, module in list(MANAGER.astroid_cache.items()):
+        path = getattr(module, "file", None)
+        if path and not os.path.realpath(path).startswith(prefixes):
+            del MANAGER.astroid_cache[name]
+
+def _run_flake8(args):
+    from flake8.main.application import Application
+    app = Application()
+    # В демоне не порождаем пул процессов flake8 на каждый запрос
+    app.run(["--jobs=1"] + list(args))
+    return app.exit_code()
+
+def _run_pylint(args):
+    from pylint.lint import Run
+    _forget_user_modules()
+    run = Run(list(args), exit=False)
+    if "--exit-zero" in args:
+        return 0
+    return run.linter.msg_status
+
+RUNNERS = {"flake8": _run_flake8, "pylint": _run_pylint}
+
+def run_in_process(tool, args, cwd):
+    """Запуск линтера в текущем процессе с перехватом вывода"""
+    out_buffer, err_buffer = io.BytesIO(), io.StringIO()
+    # flake8 пишет напрямую в sys.stdout.buffer, поэтому нужна обёртка над байтами
+    out = io.TextIOWrapper(out_buffer, encoding="utf-8", write_through=True)
+    previous_cwd = os.getcwd()
+    try:
+        os.chdir(cwd)
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err_buffer):
+            try:
+                returncode = RUNNERS[tool](args)
+            except SystemExit as e:
+                returncode = e.code if isinstance(e.code, int) else 1
+    finally:
+        os.chdir(previous_cwd)
+    out.flush()
+    return {
+        "returncode": returncode,
+        "stdout": out_buffer.getvalue().decode("utf-8"),
+        "stderr": err_buffer.getvalue(),
+    }
+
+class LinterHandler(socketserver.StreamRequestHandler):
+    """Обработка запросов одного соединения (по строке JSON на запрос)"""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                payload = json.loads(line)
+                if payload["tool"] not in RUNNERS:
+                    raise ValueError(f"неизвестный линтер: {payload['tool']}")
+                response = run_in_process(payload["tool"], payload["args"], payload["cwd"])
+            except Exception as e:
+                response = {"returncode": 1, "stdout": "", "stderr": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+def warm_up():
+    """Прогрев: импорт линтеров и пробный прогон, чтобы первый запрос не платил
+    за загрузку плагинов flake8 и модулей astroid"""
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "warm_up.py"), "w", encoding="utf-8") as f:
+            # Импорт как в работах: astroid заранее разбирает playwright.sync_api
+            f.write("from playwright.sync_api import sync_playwright\n\nprint(sync_playwright)\n")
+        for tool in RUNNERS:
+            run_in_process(tool, ["warm_up.py"], directory)
+
+def serve(socket_path=None):
+    """Запуск демона; запросы обрабатываются последовательно (chdir и stdout общие)"""
+    path = socket_path or SOCKET_PATH
+    warm_up()
+    # Бюджет памяти линтеров — на весь процесс демона (tools/limits.py)
+    limits.limit_process("linters")
+    if os.path.exists(path):
+        os.unlink(path)
+    # SIGTERM завершает демон штатно, чтобы сокет был удалён
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    with socketserver.UnixStreamServer(path, LinterHandler) as server:
+        print(f"🔌 Демон линтеров слушает {path}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+
+# === Бенчмарк ===
+
+def _measure(root, iterations):
+    """Задержка collect_results() на одну работу, без кэшей между итерациями"""
+    import analysis_cache
+    import check_linters
+    os.environ["GRADER_NO_CACHE"] = "1"  # меряем сами линтеры, а не кэш результатов
+    samples = []
+    for _ in range(iterations + 1):  # первая итерация — прогрев
+        check_linters._lint_memo.clear()
+        analysis_cache.clear()
+        started = time.perf_counter()
+        check_linters.collect_results(root)
+        samples.append(time.perf_counter() - started)
+    return samples[1:]
+
+def bench(root, iterations):
+    """Сравнение задержки линтеров: подпроцессы против демона"""
+    import check_linters
+    socket_path = os.path.join(tempfile.mkdtemp(), "linters.sock")
+    daemon = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "serve", "--socket", socket_path],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 60
+        while not os.path.exists(socket_path):
+            if daemon.poll() is not None or time.monotonic() > deadline:
+                print("❌ Демон линтеров не запустился")
+                return 1
+            time.sleep(0.05)
+
+        results = {}
+        check_linters.USE_DAEMON = False
+        results["подпроцессы"] = _measure(root, iterations)
+        check_linters.USE_DAEMON = True
+        check_linters.DAEMON_SOCKET = socket_path
+        results["демон"] = _measure(root, iterations)
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+    print(f"⏱️  Задержка линтеров на одну работу ({iterations} итераций):")
+    print("   | Режим | медиана, мс | мин, мс | макс, мс |")
+    print("   |-------|-------------|---------|----------|")
+    for mode, samples in results.items():
+        print(f"   | {mode} | {statistics.median(samples) * 1000:.0f} | "
+              f"{min(samples) * 1000:.0f} | {max(samples) * 1000:.0f} |")
+    speedup = statistics.median(results["подпроцессы"]) / statistics.median(results["демон"])
+    print(f"🚀 Ускорение: ×{speedup:.1f}")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Демон линтеров flake8/pylint")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="запустить демон")
+    serve_parser.add_argument("--socket", default=None, help="путь к Unix-сокету")
+    bench_parser = sub.add_parser("bench", help="сравнить задержку с подпроцессами")
+    bench_parser.add_argument("root", nargs="?", default=".", help="каталог работы")
+    bench_parser.add_argument("-n", "--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket)
+        return 0
+    return bench(args.root, args.iterations)
+
+if __name__ == "__main__":
+    sys.exit(main())
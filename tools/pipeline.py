@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Асинхронный конвейер проверки одной работы
+
+Этапы больше не идут друг за другом (структура → pytest → линтеры отдельным
+шагом CI). Проверка структуры решает судьбу каждого файла отдельно: найденные
+файлы сразу уходят в подпроцессы flake8 и pylint (шардами, как в
+check_linters.py), а проверки AST идут по файлам в потоках, пока линтеры
+работают. Отсутствующий файл отменяет этапы только этого файла, остальные
+проверяются как обычно. Время проверки работы — длина критического пути
+(обычно запуск pylint), а не сумма этапов.
+
+Линтеры оценивают найденные файлы: раньше без полного набора файлов CI их
+не запускал вовсе.
+
+    python tools/pipeline.py [каталог работы]
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import check_linters
+import diagnostics
+import report
+import runtime_check
+import syntax_runner
+import timing
+
+COMMANDS = {"flake8": check_linters.FLAKE8_COMMAND, "pylint": check_linters.PYLINT_COMMAND}
+
+async def lint(tool, scripts, root):
+    """{файл: замечания} линтера или исключение запуска"""
+    with timing.span(tool):
+        try:
+            return await check_linters.lint_files(tool, COMMANDS[tool], scripts, root)
+        except Exception as e:
+            return e
+
+async def check_syntax(root, fname, exists):
+    """Проверки AST одного файла; для отсутствующего — без запуска тестов"""
+    if not exists:
+        return syntax_runner.missing_file(fname)
+    return await asyncio.to_thread(syntax_runner.run_syntax_checks, root, None, {fname})
+
+def merge_syntax(parts):
+    """Результаты run_syntax_checks() по файлам → один результат"""
+    merged = {"file_status": {}, "tests": {}, "findings": {}, "limits": {}, "cached": []}
+    for part in parts:
+        for key in ("file_status", "tests", "findings", "limits"):
+            merged[key].update(part[key])
+        merged["cached"] += part["cached"]
+    return merged
+
+def merge_linters(runs, file_linters):
+    """Замечания по файлам → словарь linters_result.json
+
+    runs — {линтер: результат lint() или исключение} этого прогона,
+    file_linters — {файл: {линтер: замечания (Diagnostic.as_row())} или None}.
+    """
+    found = {}
+    for tool in report.LINTERS:
+        error = runs.get(tool)
+        if isinstance(error, Exception):
+            found[tool] = (None, check_linters.launch_error(tool, error))
+            continue
+        found[tool] = ([
+            diagnostics.Diagnostic.from_row(tool, script(fname), row)
+            for fname, by_tool in file_linters.items() if by_tool
+            for row in by_tool[tool]
+        ], None)
+    return check_linters.summarize(found)
+
+def script(fname):
+    return f"{report.PROJECT}/{fname}"
+
+class Grading:
+    """Результаты конвейера: по работе (для отчёта) и по отдельным файлам
+
+    files — {файл: {"exists", "syntax", "linters"}} для файлов, все этапы
+    которых завершились; их можно не проверять повторно, пока файл не изменился
+    (tools/incremental.py). reused — файлы, взятые из previous.
+    """
+    __slots__ = ("structure_ok", "structure_files", "syntax", "linters", "runtime",
+                 "files", "reused")
+
+    def __init__(self, structure_ok, structure_files, syntax, linters, runtime, files, reused):
+        self.structure_ok = structure_ok
+        self.structure_files = structure_files
+        self.syntax = syntax
+        self.linters = linters
+        self.runtime = runtime
+        self.files = files
+        self.reused = reused
+
+    def report(self):
+        return report.build_report(self.structure_ok, self.structure_files, self.syntax,
+                                   self.linters, self.runtime)
+
+async def grade(root=".", stages=None, previous=None):
+    """Проверка работы → Grading
+
+    previous — сохранённые Grading.files неизменённых файлов: их этапы
+    не запускаются, результаты подставляются как есть.
+    """
+    stages = report.STAGES if stages is None else stages
+    previous = previous or {}
+    structure_ok = (Path(root) / report.PROJECT).is_dir()
+
+    # Запуск скриптов — самый долгий этап: стартует сразу, отдельным процессом
+    runtime = None
+    if "runtime" in stages and structure_ok:
+        runtime = asyncio.create_task(asyncio.to_thread(runtime_check.run_in_sandbox, [root]))
+
+    project = Path(root) / report.PROJECT
+    structure_files = {fname: (project / fname).is_file() for fname in report.FILES}
+    reused = [fname for fname in report.FILES
+              if fname in previous and previous[fname]["exists"] == structure_files[fname]]
+    pending = [fname for fname in report.FILES if fname not in reused]
+    # Файл сверх лимитов размера или вложенности линтерам не отдаётся (его статус —
+    # в результатах синтаксиса); разбор здесь же достаётся проверкам AST из кэша
+    to_lint = [fname for fname in pending
+               if structure_files[fname] and syntax_runner.file_limit(project / fname) is None]
+
+    # Подпроцессы линтеров стартуют первыми и работают, пока идут проверки AST
+    linters = {}
+    if "linters" in stages and to_lint:
+        scripts = [script(fname) for fname in to_lint]
+        linters = {tool: asyncio.create_task(lint(tool, scripts, root)) for tool in report.LINTERS}
+
+    file_syntax = {fname: previous[fname]["syntax"] for fname in reused}
+    syntax = None
+    if "syntax" in stages:
+        syntax_runner.load_syntax_tests()  # до потоков: модуль тестов загружается один раз
+        parts = await asyncio.gather(*(
+            check_syntax(root, fname, structure_files[fname]) for fname in pending
+        ))
+        file_syntax.update(zip(pending, parts))
+        parts = [file_syntax[fname] for fname in report.FILES]
+        if None in syntax_runner.tests_by_file():
+            # Тесты, не привязанные к файлу
+            parts.append(await asyncio.to_thread(
+                syntax_runner.run_syntax_checks, root, None, {None}
+            ))
+        syntax = merge_syntax(parts)
+
+    runs = {tool: await task for tool, task in linters.items()}
+    file_linters = {fname: previous[fname]["linters"] for fname in reused}
+    file_linters.update((fname, None) for fname in pending)
+    failed = any(isinstance(found, Exception) for found in runs.values())
+    if runs and not failed:
+        for fname in to_lint:
+            file_linters[fname] = {tool: [d.as_row() for d in found[script(fname)]]
+                                   for tool, found in runs.items()}
+    linters = None
+    if runs or ("linters" in stages and any(file_linters.values())):
+        linters = merge_linters(runs, {fname: file_linters[fname] for fname in report.FILES})
+
+    runtime_results = None
+    if runtime is not None:
+        try:
+            runtime_results = (await runtime)["works"][root]
+        except Exception as e:
+            print(f"⚠️ Этап запуска скриптов не выполнен: {e}")
+
+    files = {
+        fname: {"exists": structure_files[fname], "syntax": file_syntax.get(fname),
+                "linters": file_linters[fname]}
+        for fname in report.FILES if not (failed and fname in to_lint)
+    }
+    return Grading(structure_ok, structure_files, syntax, linters, runtime_results, files, reused)
+
+def run(root=".", stages=None, previous=None):
+    """Синхронная обёртка над grade() → Grading"""
+    with timing.span("pipeline"):
+        return asyncio.run(grade(root, stages, previous))
+
+def main():
+    root = sys.argv[1] if len(sys.argv) > 1 else "."
+    started = time.perf_counter()
+    result = run(root).report()
+    report.render_markdown(result, sys.stdout)
+    print(f"\n⏱️ Проверено за {time.perf_counter() - started:.2f} с")
+    return result.exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
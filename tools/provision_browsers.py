@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Подготовка браузеров Playwright только для тех этапов, которым они нужны
+
+Статические этапы (структура, синтаксис, линтеры) браузеры не запускают,
+поэтому при проверке только ими установка браузеров пропускается целиком.
+Если браузеры нужны, они ставятся в версионированный каталог кэша
+(<кэш>/<версия playwright>/), содержимое которого фиксируется в manifest.json
+контрольными суммами SHA-256. Повторный запуск проверяет суммы и переиспользует
+каталог без скачивания.
+
+    python tools/provision_browsers.py plan --stages structure,syntax,linters
+    python tools/provision_browsers.py provision --stages runtime
+    python tools/provision_browsers.py verify --playwright-version 1.47.0
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from importlib import metadata
+from pathlib import Path
+
+import task_spec
+
+# Этап проверки → браузеры, которые он запускает
+STAGE_BROWSERS = {
+    "structure": (),
+    "syntax": (),
+    "linters": (),
+    # tools/runtime_check.py: браузеры из раздела runtime описания задания
+    "runtime": tuple(task_spec.load().runtime_browsers),
+}
+DEFAULT_STAGES = ("structure", "syntax", "linters")
+
+CACHE_ROOT = os.getenv(
+    "GRADER_BROWSERS_CACHE",
+    os.path.join(os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "grader-browsers"),
+)
+MANIFEST = "manifest.json"
+
+def required_browsers(stages):
+    """Браузеры, нужные выбранным этапам (в порядке объявления)"""
+    browsers = []
+    for stage in stages:
+        if stage not in STAGE_BROWSERS:
+            raise ValueError(f"неизвестный этап: {stage}")
+        for browser in STAGE_BROWSERS[stage]:
+            if browser not in browsers:
+                browsers.append(browser)
+    return browsers
+
+def playwright_version(override=None):
+    """Версия пакета playwright (от неё зависят ревизии браузеров)"""
+    if override:
+        return override
+    try:
+        return metadata.version("playwright")
+    except metadata.PackageNotFoundError:
+        raise RuntimeError("пакет playwright не установлен; укажите --playwright-version") from None
+
+def cache_dir(version, root=None):
+    return Path(root or CACHE_ROOT) / version
+
+def browser_dirs(directory, browser):
+    """Каталоги ревизий браузера в PLAYWRIGHT_BROWSERS_PATH (chromium-1140 и т.п.)"""
+    prefixes = (f"{browser}-", f"{browser}_")
+    return sorted(
+        entry for entry in Path(directory).iterdir()
+        if entry.is_dir() and entry.name.startswith(prefixes)
+    )
+
+def tree_checksum(directory):
+    """SHA-256 дерева: относительные пути и содержимое файлов в стабильном порядке"""
+    h = hashlib.sha256()
+    directory = Path(directory)
+    for path in sorted(p for p in directory.rglob("*") if p.is_file() and not p.is_symlink()):
+        h.update(path.relative_to(directory).as_posix().encode("utf-8") + b"\0")
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+def write_manifest(directory, version, browsers):
+    """Фиксация содержимого каталога: браузер → {каталог ревизии: сумма}"""
+    manifest = {"playwright": version, "browsers": {}}
+    for browser in browsers:
+        dirs = browser_dirs(directory, browser)
+        if not dirs:
+            raise RuntimeError(f"после установки не найден каталог браузера {browser}")
+        manifest["browsers"][browser] = {d.name: tree_checksum(d) for d in dirs}
+    with open(Path(directory) / MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+def verify(directory, browsers):
+    """Проверка кэша по manifest.json: список проблем (пустой — кэш годен)"""
+    manifest_path = Path(directory) / MANIFEST
+    if not manifest_path.exists():
+        return [f"нет {MANIFEST} в {directory}"]
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    problems = []
+    for browser in browsers:
+        recorded = manifest.get("browsers", {}).get(browser)
+        if not recorded:
+            problems.append(f"{browser}: отсутствует в кэше")
+            continue
+        for name, checksum in recorded.items():
+            path = Path(directory) / name
+            if not path.is_dir():
+                problems.append(f"{browser}: нет каталога {name}")
+            elif tree_checksum(path) != checksum:
+                problems.append(f"{browser}: контрольная сумма {name} не совпадает")
+    return problems
+
+def install(directory, browsers, with_deps=False):
+    """Установка браузеров в каталог кэша через `playwright install`"""
+    env = dict(os.environ, PLAYWRIGHT_BROWSERS_PATH=str(directory))
+    command = [sys.executable, "-m", "playwright", "install"]
+    if with_deps:
+        command.append("--with-deps")
+    subprocess.run(command + list(browsers), env=env, check=True)
+
+def install_deps(browsers):
+    """Установка только системных зависимостей браузеров"""
+    subprocess.run([sys.executable, "-m", "playwright", "install-deps"] + list(browsers), check=True)
+
+def provision(stages, root=None, version=None, offline=False, with_deps=False):
+    """Каталог с проверенными браузерами для этапов или None, если они не нужны"""
+    browsers = required_browsers(stages)
+    if not browsers:
+        return None
+    directory = cache_dir(playwright_version(version), root)
+    problems = verify(directory, browsers) if directory.exists() else ["кэш пуст"]
+    if not problems:
+        # Системные библиотеки в кэш каталога не входят: на чистой машине их
+        # нужно поставить, даже если сами браузеры взяты из кэша
+        if with_deps and not offline:
+            install_deps(browsers)
+        return directory
+    if offline:
+        raise RuntimeError("кэш браузеров непригоден: " + "; ".join(problems))
+    directory.mkdir(parents=True, exist_ok=True)
+    install(directory, browsers, with_deps)
+    write_manifest(directory, playwright_version(version), browsers)
+    return directory
+
+def write_github_output(values):
+    """Передача значений следующим шагам workflow (если запущено в Actions)"""
+    output = os.getenv("GITHUB_OUTPUT")
+    if not output:
+        return
+    with open(output, "a", encoding="utf-8") as f:
+        for key, value in values.items():
+            f.write(f"{key}={value}\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Подготовка браузеров Playwright")
+    parser.add_argument("command", choices=["plan", "provision", "verify"])
+    parser.add_argument("--stages", default=os.getenv("GRADER_STAGES", ",".join(DEFAULT_STAGES)),
+                        help="этапы проверки через запятую")
+    parser.add_argument("--cache-dir", default=None, help="корень кэша браузеров")
+    parser.add_argument("--playwright-version", default=None, help="версия без обращения к pip")
+    parser.add_argument("--offline", action="store_true", help="только готовый кэш, без скачивания")
+    parser.add_argument("--with-deps", action="store_true", help="также системные зависимости")
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    try:
+        browsers = required_browsers(stages)
+        if args.command == "plan":
+            needs = bool(browsers)
+            values = {"needs_browsers": str(needs).lower(), "browsers": " ".join(browsers)}
+            if needs:
+                values["cache_key"] = f"{playwright_version(args.playwright_version)}-{'-'.join(browsers)}"
+            write_github_output(values)
+            if needs:
+                print(f"🌐 Этапам нужны браузеры: {', '.join(browsers)}")
+            else:
+                print("✅ Выбранные этапы статические — установка браузеров не нужна")
+            return 0
+
+        if args.command == "verify":
+            if not browsers:
+                print("✅ Выбранным этапам браузеры не нужны")
+                return 0
+            directory = cache_dir(playwright_version(args.playwright_version), args.cache_dir)
+            problems = verify(directory, browsers)
+            for problem in problems:
+                print(f"❌ {problem}")
+            if not problems:
+                print(f"✅ Кэш браузеров {directory} цел")
+            return 1 if problems else 0
+
+        directory = provision(stages, args.cache_dir, args.playwright_version,
+                              args.offline, args.with_deps)
+    except (RuntimeError, ValueError, subprocess.CalledProcessError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    if directory is None:
+        print("✅ Выбранные этапы статические — установка браузеров пропущена")
+        return 0
+    write_github_output({"browsers_path": directory})
+    github_env = os.getenv("GITHUB_ENV")
+    if github_env:
+        with open(github_env, "a", encoding="utf-8") as f:
+            f.write(f"PLAYWRIGHT_BROWSERS_PATH={directory}\n")
+    print(f"✅ Браузеры готовы: {directory}")
+    print(f"   export PLAYWRIGHT_BROWSERS_PATH={directory}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
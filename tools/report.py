@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""Единый движок отчёта: модель результатов и её представления
+
+Результаты проверок собираются один раз в типизированную модель (Report),
+из которой затем выводятся Markdown для GitHub step summary, JSON и JUnit XML.
+Представления пишутся в файл построчно, без сборки всего текста в памяти.
+
+    python tools/report.py                       # SUMMARY.md / GITHUB_STEP_SUMMARY
+    python tools/report.py --format json,junit   # report.json, report.junit.xml
+    python tools/report.py --layout structure    # прежний отчёт generate_summary_1.py
+    python tools/report.py --watch               # перепроверка при сохранении
+
+Для пакетной проверки write_if_changed() сравнивает отпечаток модели
+с сохранённым и пропускает перезапись отчётов студентов без изменений.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+import result_cache
+import task_spec
+import timing
+
+TASK = task_spec.load()
+FILES = TASK.file_names
+PROJECT = TASK.project_dir
+LINTERS = ["flake8", "pylint"]
+LINTERS_PASS = 8  # сумма баллов линтеров, при которой стиль считается приемлемым
+
+# Этапы проверки; этап runtime (запуск скриптов в браузерах) включается явно
+STAGES = [s.strip() for s in os.getenv("GRADER_STAGES", "structure,syntax,linters").split(",")]
+
+FORMATS = ["markdown", "json", "junit"]
+OUTPUT_FILES = {"markdown": "SUMMARY.md", "json": "report.json", "junit": "report.junit.xml"}
+FINGERPRINT_FILE = ".report.sha256"
+
+# === МОДЕЛЬ ===
+
+@dataclass
+class TestResult:
+    name: str
+    file: Optional[str]
+    passed: bool
+    message: Optional[str] = None
+
+@dataclass
+class RuntimeResult:
+    passed: bool
+    problems: List[str]
+    seconds: float
+    launch_calls: int
+
+@dataclass
+class FileResult:
+    name: str
+    exists: bool
+    syntax_ok: Optional[bool] = None  # None — синтаксис не проверялся
+    runtime: Optional[RuntimeResult] = None
+    limit: Optional[str] = None  # превышенный лимит (tools/limits.py)
+
+    @property
+    def state(self):
+        """missing | limit_exceeded | runtime_failed | passed | failed"""
+        if not self.exists:
+            return "missing"
+        if self.limit is not None:
+            return "limit_exceeded"
+        if self.syntax_ok and self.runtime is not None and not self.runtime.passed:
+            return "runtime_failed"
+        return "passed" if self.syntax_ok else "failed"
+
+@dataclass
+class LinterResult:
+    tool: str
+    score: int
+    errors: int
+    details: List[str]
+
+@dataclass
+class Report:
+    structure_ok: bool
+    files: List[FileResult]
+    tests: List[TestResult] = field(default_factory=list)
+    linters: Optional[List[LinterResult]] = None  # None — результатов линтеров нет
+    linters_total: Optional[int] = None
+    timings: Dict[str, dict] = field(default_factory=dict)
+
+    @property
+    def files_complete(self):
+        return self.structure_ok and all(f.exists for f in self.files)
+
+    @property
+    def needs_fix(self):
+        return any(f.state in ("failed", "limit_exceeded", "runtime_failed") for f in self.files)
+
+    @property
+    def style_ok(self):
+        return self.linters_total is not None and self.linters_total >= LINTERS_PASS
+
+    @property
+    def exit_code(self):
+        return 0 if self.structure_ok and not self.needs_fix else 1
+
+    def as_dict(self):
+        data = asdict(self)
+        for entry, result in zip(data["files"], self.files):
+            entry["state"] = result.state
+        data["exit_code"] = self.exit_code
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Модель из as_dict() (сохранённые результаты, tools/results_store.py)"""
+        files = [
+            FileResult(f["name"], f["exists"], f["syntax_ok"],
+                       RuntimeResult(**f["runtime"]) if f["runtime"] else None, f["limit"])
+            for f in data["files"]
+        ]
+        linters = data["linters"]
+        return cls(
+            structure_ok=data["structure_ok"],
+            files=files,
+            tests=[TestResult(**test) for test in data["tests"]],
+            linters=[LinterResult(**linter) for linter in linters] if linters is not None else None,
+            linters_total=data["linters_total"],
+            timings=data.get("timings", {}),
+        )
+
+    def fingerprint(self):
+        """Отпечаток результатов (без замеров) и версии движка отчёта"""
+        data = self.as_dict()
+        data.pop("timings")
+        payload = json.dumps(data, sort_keys=True, ensure_ascii=False)
+        version = result_cache.checker_version(Path(__file__).resolve())
+        return hashlib.sha256(f"{version}\0{payload}".encode("utf-8")).hexdigest()
+
+# === СБОР РЕЗУЛЬТАТОВ ===
+
+def check_structure(root=None):
+    """Наличие папки задания и её файлов (без README.md)"""
+    project = Path(root or ".") / PROJECT
+    if not project.is_dir():
+        return False, {fname: False for fname in FILES}
+    return True, {fname: (project / fname).is_file() for fname in FILES}
+
+def linter_results(linters):
+    """Словарь linters_result.json → список LinterResult"""
+    return [
+        LinterResult(tool, linters[f"{tool}_score"], linters[f"{tool}_errors"],
+                     list(linters[f"{tool}_details"]))
+        for tool in LINTERS
+    ]
+
+def build_report(structure_ok, structure_files, syntax=None, linters=None, runtime=None):
+    """Модель отчёта из результатов этапов
+
+    syntax — результат syntax_runner.run_syntax_checks(), linters — словарь
+    linters_result.json, runtime — {файл: {...}} этапа запуска; любой из них
+    может отсутствовать (None), если этап не выполнялся.
+    """
+    file_status = syntax["file_status"] if syntax else {}
+    file_limits = syntax["limits"] if syntax else {}
+    files = []
+    for fname in FILES:
+        run = runtime.get(fname) if runtime else None
+        files.append(FileResult(
+            name=fname,
+            exists=bool(structure_files and structure_files.get(fname)),
+            syntax_ok=file_status.get(fname) if syntax else None,
+            runtime=RuntimeResult(run["passed"], list(run["problems"]), run["seconds"],
+                                  len(run["launch_calls"])) if run else None,
+            limit=file_limits.get(fname),
+        ))
+    tests = [
+        TestResult(name, data["file"], data["passed"], data["message"])
+        for name, data in (syntax["tests"].items() if syntax else ())
+    ]
+    return Report(
+        structure_ok=structure_ok,
+        files=files,
+        tests=tests,
+        linters=linter_results(linters) if linters else None,
+        linters_total=linters["total"] if linters else None,
+    )
+
+def collect(root=None, stages=None):
+    """Однократный прогон этапов для работы в каталоге root → Report
+
+    Этапы выполняются асинхронным конвейером (tools/pipeline.py), с
+    GRADER_INCREMENTAL — только для изменённых файлов (tools/incremental.py).
+    """
+    import incremental  # incremental импортирует report
+    stages = STAGES if stages is None else stages
+    return incremental.grade(root or ".", stages).report()
+
+# === MARKDOWN ===
+
+STATUS = {
+    "missing": ("❌ отсутствует", f"Файл не найден в папке {PROJECT}/"),
+    "passed": ("✅ пройден", "Файл существует и прошёл тесты"),
+    "failed": ("⚠️ требует исправления", "Файл существует, но тесты упали"),
+    "runtime_failed": ("⚠️ требует исправления", "Тесты пройдены, но при запуске: "),
+    "limit_exceeded": ("⛔ превышен лимит", "Проверка файла остановлена: "),
+}
+
+def _file_status(result):
+    status, reason = STATUS[result.state]
+    if result.state == "runtime_failed":
+        reason += "; ".join(result.runtime.problems)
+    elif result.state == "limit_exceeded":
+        reason += result.limit
+    return status, reason
+
+def _linter_list(out, details, limit):
+    for i, detail in enumerate(details[:limit], 1):
+        out.write(f"  {i}. `{detail}`\n")
+
+def _timings(out, data):
+    lines = timing.render_markdown(data)
+    if lines:
+        out.write("\n")
+        for line in lines:
+            out.write(line + "\n")
+
+def render_markdown(report, out):
+    """Отчёт с объединённой таблицей статусов (формат generate_summary.py)"""
+    w = out.write
+    w(f"# 📊 Автопроверка домашнего задания: {TASK.title}\n\n")
+
+    # Объединённая таблица статусов
+    w("## 📁 Структура и результаты проверки\n\n")
+    w("| Файл | Статус | Причина |\n")
+    w("|------|--------|---------|\n")
+    for result in report.files:
+        status, reason = _file_status(result)
+        w(f"| `{result.name}` | {status} | {reason} |\n")
+    w("\n")
+
+    # Запуск скриптов
+    runs = [f for f in report.files if f.runtime is not None]
+    if runs:
+        w("## 🎭 Запуск скриптов\n\n")
+        w("| Файл | Результат | Время, с | Вызовов launch() |\n")
+        w("|------|-----------|----------|------------------|\n")
+        for result in runs:
+            run = result.runtime
+            outcome = "✅" if run.passed else "❌ " + "; ".join(run.problems)
+            w(f"| `{result.name}` | {outcome} | {run.seconds} | {run.launch_calls} |\n")
+        w("\n")
+
+    # Ошибки линтеров
+    if report.linters:
+        w("## 🔍 Ошибки линтеров\n\n")
+        for linter in report.linters:
+            w(f"**{linter.tool}:** {linter.score}/10 баллов ({linter.errors} ошибок)\n")
+            if linter.details:
+                _linter_list(out, linter.details, 15)
+            w("\n")
+
+    # Итог
+    w("## 🏆 Итоговая оценка\n\n")
+    if not report.structure_ok:
+        w(f"❌ **РАБОТА НЕ ПРИНЯТА** — отсутствует папка `{PROJECT}`\n")
+    elif report.needs_fix:
+        w("⚠️ **ДОРАБОТКА** — некоторые файлы не прошли проверку\n")
+    else:
+        w("✅ **ЗАЧЁТ** — все файлы присутствуют и прошли проверку\n")
+        if report.style_ok:
+            w("✅ Стиль кода соответствует требованиям\n")
+        else:
+            w("💡 Рекомендуется исправить замечания линтеров\n")
+    w("\n> 💡 `README.md` не проверяется — задание фокусируется на коде.\n")
+    _timings(out, report.timings)
+
+def render_markdown_structure(report, out):
+    """Отчёт по структуре и подробный список замечаний (формат generate_summary_1.py)"""
+    w = out.write
+    w(f"# 📊 Автопроверка домашнего задания: {TASK.title}\n\n")
+
+    # Секция 1: Структура проекта
+    w("## 📁 Структура проекта\n\n")
+    if report.structure_ok:
+        w(f"✅ Папка `{PROJECT}` существует\n\n")
+        w("| Файл | Статус |\n")
+        w("|------|--------|\n")
+        for result in report.files:
+            w(f"| `{result.name}` | {'✅' if result.exists else '❌'} |\n")
+        w("\n")
+    else:
+        w(f"❌ **Папка `{PROJECT}` отсутствует**\n\n")
+        w("Требуемая структура:\n")
+        w("```\n")
+        w(f"{PROJECT}/\n")
+        for i, fname in enumerate(FILES):
+            w(f"{'└──' if i == len(FILES) - 1 else '├──'} {fname}\n")
+        w("```\n\n")
+
+    # Секция 2: Линтеры
+    if report.files_complete and report.linters:
+        w("## 🔍 Ошибки линтеров\n\n")
+        for linter in report.linters:
+            if linter.tool == "flake8":
+                w("### flake8 (PEP 8)\n")
+            else:
+                w(f"### {linter.tool}\n")
+            w(f"- Баллы: **{linter.score}** / 10\n")
+            if linter.tool == "pylint":
+                w(f"- Критических ошибок: {linter.errors}\n")
+            else:
+                w(f"- Ошибок: {linter.errors}\n")
+            if linter.details:
+                w("- Список:\n")
+                _linter_list(out, linter.details, 25)
+                if len(linter.details) > 25:
+                    w(f"  ... и ещё {len(linter.details) - 25}\n")
+            else:
+                w("- ✅ Ошибок нет\n")
+            w("\n")
+
+    # Итог
+    w("## 🏆 Итог\n\n")
+    if not report.structure_ok:
+        w(f"❌ **РАБОТА НЕ ПРИНЯТА** — отсутствует папка `{PROJECT}`\n")
+    elif not report.files_complete:
+        w("⚠️ **ДОРАБОТКА** — не все файлы присутствуют (см. таблицу выше)\n")
+    else:
+        w("✅ **Структура проекта корректна**\n")
+        if report.style_ok:
+            w("✅ **Стиль кода соответствует требованиям**\n")
+        else:
+            w("⚠️ **Требуется исправить замечания линтеров** (см. раздел выше)\n")
+    w("\n> 💡 `README.md` не проверяется — задание фокусируется на коде.\n")
+    _timings(out, report.timings)
+
+# === JSON И JUNIT ===
+
+def render_json(report, out):
+    json.dump(report.as_dict(), out, ensure_ascii=False, indent=2)
+    out.write("\n")
+
+def _testcase(out, classname, name, failure=None, seconds=None):
+    time_attr = f" time={quoteattr(str(seconds))}" if seconds is not None else ""
+    out.write(f"    <testcase classname={quoteattr(classname)} name={quoteattr(name)}{time_attr}")
+    if failure is None:
+        out.write("/>\n")
+        return
+    message, text = failure
+    out.write(f">\n      <failure message={quoteattr(message)}>{escape(text)}</failure>\n")
+    out.write("    </testcase>\n")
+
+def _suite(out, name, cases):
+    """cases — список (classname, name, failure или None, время или None)"""
+    failures = sum(1 for case in cases if case[2] is not None)
+    out.write(f"  <testsuite name={quoteattr(name)} tests=\"{len(cases)}\" "
+              f"failures=\"{failures}\" errors=\"0\">\n")
+    for case in cases:
+        _testcase(out, *case)
+    out.write("  </testsuite>\n")
+
+def render_junit(report, out):
+    """JUnit XML: по набору тестов на этап (структура, синтаксис, линтеры, запуск)"""
+    out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    out.write('<testsuites name="playwright-grader">\n')
+
+    structure = [("structure", PROJECT, None if report.structure_ok
+                  else (f"папка {PROJECT} отсутствует", ""), None)]
+    structure += [
+        ("structure", f.name, None if f.exists else ("файл не найден", ""), None)
+        for f in report.files
+    ]
+    _suite(out, "structure", structure)
+
+    if report.tests:
+        _suite(out, "syntax", [
+            (f"syntax.{t.file or 'project'}", t.name,
+             None if t.passed else (t.message or "тест не пройден", t.message or ""), None)
+            for t in report.tests
+        ])
+
+    if report.linters:
+        _suite(out, "linters", [
+            ("linters", linter.tool,
+             None if linter.errors == 0 else (f"{linter.score}/10 баллов, {linter.errors} ошибок",
+                                              "\n".join(linter.details)), None)
+            for linter in report.linters
+        ])
+
+    runs = [f for f in report.files if f.runtime is not None]
+    if runs:
+        _suite(out, "runtime", [
+            ("runtime", f.name,
+             None if f.runtime.passed else ("; ".join(f.runtime.problems),
+                                            "\n".join(f.runtime.problems)),
+             f.runtime.seconds)
+            for f in runs
+        ])
+    out.write("</testsuites>\n")
+
+RENDERERS = {"markdown": render_markdown, "json": render_json, "junit": render_junit}
+LAYOUTS = {"combined": render_markdown, "structure": render_markdown_structure}
+
+# === ЗАПИСЬ ===
+
+def output_path(fmt, directory=None):
+    """Файл для формата; Markdown без каталога идёт в GITHUB_STEP_SUMMARY, если он есть"""
+    if fmt == "markdown" and directory is None:
+        github_summary = os.getenv("GITHUB_STEP_SUMMARY")
+        if github_summary and os.path.exists(github_summary):
+            return Path(github_summary)
+    return Path(directory or ".") / OUTPUT_FILES[fmt]
+
+def write(report, formats=None, directory=None, layout="combined"):
+    """Вывод модели в файлы выбранных форматов; возвращает {формат: путь}"""
+    paths = {}
+    for fmt in formats or ["markdown"]:
+        render = LAYOUTS[layout] if fmt == "markdown" else RENDERERS[fmt]
+        path = output_path(fmt, directory)
+        with timing.span(f"report.{fmt}"):
+            with open(path, "w", encoding="utf-8") as f:
+                render(report, f)
+        paths[fmt] = path
+    return paths
+
+def write_if_changed(report, directory, formats=None, layout="combined"):
+    """Перезапись отчётов в directory, только если результаты изменились
+
+    Отпечаток модели хранится рядом с отчётами; при совпадении и наличии
+    всех файлов запись пропускается. Возвращает True, если отчёты записаны.
+    """
+    formats = formats or FORMATS
+    directory = Path(directory)
+    marker = directory / FINGERPRINT_FILE
+    fingerprint = f"{report.fingerprint()} {layout} {','.join(formats)}"
+    try:
+        previous = marker.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        previous = None
+    if previous == fingerprint and all((directory / OUTPUT_FILES[fmt]).exists() for fmt in formats):
+        return False
+    write(report, formats, directory, layout)
+    marker.write_text(fingerprint, encoding="utf-8")
+    return True
+
+def parse_formats(value):
+    formats = [s.strip() for s in value.split(",") if s.strip()]
+    unknown = [fmt for fmt in formats if fmt not in RENDERERS]
+    if unknown:
+        raise ValueError(f"неизвестный формат: {', '.join(unknown)}")
+    return formats
+
+def main(argv=None, layout="combined", stages=None):
+    parser = argparse.ArgumentParser(description="Отчёт о проверке работы")
+    parser.add_argument("--format", default=os.getenv("GRADER_REPORT_FORMATS", "markdown"),
+                        help="форматы через запятую: markdown, json, junit")
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default=layout,
+                        help="вид Markdown-отчёта")
+    parser.add_argument("--root", default=".", help="каталог работы")
+    parser.add_argument("--watch", action="store_true",
+                        help="перепроверять при сохранении файлов (tools/watch.py)")
+    args = parser.parse_args(argv)
+    if args.watch:
+        import watch  # watch импортирует report
+        return watch.main([args.root])
+    try:
+        formats = parse_formats(args.format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    report = collect(args.root, stages)
+
+    # Замеры: timings.json рядом с linters_result.json и свёрнутая таблица в отчёте.
+    # Отчёт выводится дважды: первый вывод замеряется (этапы report.<формат>
+    # попадают в timings.json), второй — уже с таблицей замеров
+    if timing.timings.enabled:
+        write(report, formats, layout=args.layout)
+        timing.timings.save("generate_summary")
+        report.timings = timing.load()
+
+    paths = write(report, formats, layout=args.layout)
+
+    if args.layout == "structure":
+        # Консольный вывод прежнего generate_summary_1.py: отчёт, если он записан
+        # в SUMMARY.md, или отметка о записи в GITHUB_STEP_SUMMARY
+        if paths.get("markdown") == output_path("markdown", "."):
+            LAYOUTS[args.layout](report, sys.stdout)
+        elif "markdown" in paths:
+            print("✅ Отчёт сформирован")
+        return 0 if report.files_complete else 1
+    return report.exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Дисковый кэш результатов проверки по хэшу содержимого файлов
+
+Ключ записи — пространство имён (syntax, flake8, pylint), SHA-256 проверяемого
+файла и версия проверяющего кода/правил. Если студент изменил только один
+файл (или только README.md), результаты остальных берутся из кэша.
+
+Кэш хранится в SQLite (безопасно для нескольких процессов пакетного режима),
+размер ограничен: при превышении удаляются давно не использованные записи.
+
+Переменные окружения:
+    GRADER_CACHE_DIR        — каталог кэша (по умолчанию ~/.cache/playwright-grader)
+    GRADER_CACHE_MAX_BYTES  — предельный размер данных (по умолчанию 64 МиБ)
+    GRADER_NO_CACHE         — отключить кэш
+    GRADER_MEMO_ENTRIES     — записей в каждом кэше в памяти процесса (по умолчанию 2048)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+CACHE_DIR = os.getenv(
+    "GRADER_CACHE_DIR",
+    os.path.join(os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "playwright-grader"),
+)
+MAX_BYTES = int(os.getenv("GRADER_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+MEMO_ENTRIES = int(os.getenv("GRADER_MEMO_ENTRIES", "2048"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+class ResultCache:
+    """LRU-кэш результатов с ограничением по суммарному размеру"""
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or CACHE_DIR
+        self.max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        # Кэшем пользуются потоки линтеров, поэтому соединение общее под блокировкой
+        self.lock = threading.RLock()
+        self.db = sqlite3.connect(
+            os.path.join(self.directory, "results.sqlite3"), timeout=30, check_same_thread=False
+        )
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    @staticmethod
+    def make_key(namespace, digest, version):
+        return hashlib.sha256(f"{namespace}\0{version}\0{digest}".encode()).hexdigest()
+
+    def get(self, namespace, digest, version):
+        """Результат из кэша или None; обращение продлевает жизнь записи"""
+        key = self.make_key(namespace, digest, version)
+        with self.lock:
+            row = self.db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            with self.db:
+                self.db.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, namespace, digest, version, value):
+        """Сохранение результата с последующим вытеснением старых записей"""
+        key = self.make_key(namespace, digest, version)
+        data = json.dumps(value, ensure_ascii=False)
+        with self.lock:
+            with self.db:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, data, len(data.encode("utf-8")), time.time()),
+                )
+            self.evict()
+
+    def evict(self):
+        """Удаление давно не использованных записей сверх предельного размера"""
+        with self.lock:
+            self._evict()
+
+    def _evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        stale = []
+        for key, size in self.db.execute("SELECT key, size FROM entries ORDER BY last_used"):
+            stale.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        with self.db:
+            self.db.executemany("DELETE FROM entries WHERE key = ?", stale)
+
+    def close(self):
+        self.db.close()
+
+_default = None
+
+def default_cache():
+    """Общий кэш процесса; None, если кэш отключён или недоступен"""
+    global _default
+    if os.getenv("GRADER_NO_CACHE"):
+        return None
+    if _default is None:
+        try:
+            _default = ResultCache()
+        except (OSError, sqlite3.Error):
+            return None
+    return _default
+
+class MemoryCache(OrderedDict):
+    """Кэш в памяти процесса с вытеснением давно не использованных записей
+
+    Для кэшей по хэшу содержимого: в долгоживущем процессе (grading_server.py)
+    обычный словарь рос бы с каждой проверенной работой. Обращения из потоков
+    конвейера идут под блокировкой.
+    """
+
+    def __init__(self, max_entries=None):
+        super().__init__()
+        self.max_entries = MEMO_ENTRIES if max_entries is None else max_entries
+        self.lock = threading.RLock()
+
+    def __getitem__(self, key):
+        with self.lock:
+            value = super().__getitem__(key)
+            self.move_to_end(key)
+            return value
+
+    def get(self, key, default=None):
+        with self.lock:
+            return self[key] if key in self else default
+
+    def __setitem__(self, key, value):
+        with self.lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            while len(self) > self.max_entries:
+                self.popitem(last=False)
+
+_versions = {}
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+def checker_version(*parts):
+    """Версия проверяющего кода: хэш файлов (Path) и строк-параметров
+
+    Для файла учитываются имя и содержимое, но не каталог, поэтому одинаковые
+    конфиги разных работ дают одну версию. Отсутствующий файл тоже учитывается:
+    появление, например, .pylintrc в работе меняет версию.
+    """
+    key = tuple(
+        (str(part), _signature(part)) if isinstance(part, Path) else (str(part), False)
+        for part in parts
+    )
+    version = _versions.get(key)
+    if version is None:
+        h = hashlib.sha256()
+        for part, signature in key:
+            if signature is False:
+                h.update(b"str\0" + part.encode("utf-8") + b"\0")
+                continue
+            h.update(b"file\0" + Path(part).name.encode("utf-8") + b"\0")
+            if signature is not None:
+                with open(part, "rb") as f:
+                    h.update(hashlib.sha256(f.read()).digest())
+        version = h.hexdigest()[:16]
+        _versions[key] = version
+    return version
+
+def forget(root):
+    """Удаление версий, посчитанных по файлам каталога root (временный
+    каталог проверенной работы в долгоживущем процессе)"""
+    prefixes = (os.path.join(str(root), ""), os.path.join(os.path.abspath(root), ""))
+    stale = [key for key in _versions
+             if any(signature is not False and part.startswith(prefixes) for part, signature in key)]
+    for key in stale:
+        del _versions[key]
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""Хранилище результатов проверок группы для аналитики
+
+Каждая проверка работы дописывается в SQLite отдельным прогоном: сводка
+(студент, коммит, время, итог, баллы линтеров), статусы файлов и все
+замечания линтеров строками таблицы — с индексами по студенту, файлу, коду
+замечания и коммиту. Полный отчёт прогона хранится сжатым JSON рядом со
+сводкой, поэтому отчёт студента собирается из одной строки его последнего
+прогона, без чтения остальной группы.
+
+Агрегаты считает SQLite (самые частые коды flake8 и pylint, доля зачтённых
+по файлам, распределение баллов по дням), а выгрузка идёт курсором построчно:
+объём памяти не зависит от числа прогонов.
+
+    python tools/results_store.py reports/results.sqlite3 stats --tool flake8
+    python tools/results_store.py reports/results.sqlite3 report alice
+    python tools/results_store.py reports/results.sqlite3 history alice
+    python tools/results_store.py reports/results.sqlite3 export diagnostics --format csv
+
+batch_grade.py дописывает прогоны в reports/results.sqlite3 сам.
+"""
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+import diagnostics
+import report
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    student TEXT NOT NULL,
+    commit_sha TEXT,
+    graded_at REAL NOT NULL,
+    passed INTEGER NOT NULL,
+    structure_ok INTEGER NOT NULL,
+    linters_total INTEGER,
+    report BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_student ON runs (student, id);
+CREATE INDEX IF NOT EXISTS runs_commit ON runs (commit_sha);
+
+CREATE TABLE IF NOT EXISTS files (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    file TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (run_id, file)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS files_file ON files (file, state);
+
+CREATE TABLE IF NOT EXISTS diagnostics (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    file TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    code TEXT NOT NULL,
+    line INTEGER,
+    col INTEGER,
+    weight REAL NOT NULL,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS diagnostics_run ON diagnostics (run_id);
+CREATE INDEX IF NOT EXISTS diagnostics_code ON diagnostics (tool, code);
+CREATE INDEX IF NOT EXISTS diagnostics_file ON diagnostics (file);
+
+-- Текущее состояние группы: последний прогон каждого студента
+CREATE VIEW IF NOT EXISTS latest_runs AS
+    SELECT * FROM runs WHERE id IN (SELECT MAX(id) FROM runs GROUP BY student);
+"""
+
+# Колонки выгрузки: таблица → запрос (замечания и файлы — с данными прогона)
+EXPORTS = {
+    "runs": "SELECT id, student, commit_sha, graded_at, passed, structure_ok, linters_total"
+            " FROM runs ORDER BY id",
+    "files": "SELECT r.id AS run_id, r.student, r.commit_sha, r.graded_at, f.file, f.state"
+             " FROM files f JOIN runs r ON r.id = f.run_id ORDER BY f.run_id, f.file",
+    "diagnostics": "SELECT r.id AS run_id, r.student, r.commit_sha, r.graded_at, d.file, d.tool,"
+                   " d.code, d.line, d.col, d.weight, d.message"
+                   " FROM diagnostics d JOIN runs r ON r.id = d.run_id ORDER BY d.run_id",
+}
+EXPORT_BATCH = 1000  # строк курсора за одно чтение
+
+def run_record(student, result, files=None, commit=None, graded_at=None):
+    """Результаты одной проверки → запись для ResultsStore.append()
+
+    result — report.Report, files — pipeline.Grading.files (замечания линтеров
+    по файлам: все, включая не влияющие на баллы; влияние — в колонке weight).
+    """
+    data = result.as_dict()
+    data.pop("timings")
+    rows = []
+    for fname, entry in (files or {}).items():
+        for tool, found in (entry["linters"] or {}).items():
+            for line, col, code, message in found:
+                rows.append((fname, tool, code, line, col, diagnostics.weight(tool, code), message))
+    return {
+        "student": student,
+        "commit": commit,
+        "graded_at": time.time() if graded_at is None else graded_at,
+        "report": data,
+        "diagnostics": rows,
+    }
+
+class ResultsStore:
+    """Прогоны проверок группы в SQLite: запись пачками, агрегаты, выгрузка"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        # Как в result_cache: соединение общее для потоков под блокировкой
+        self.lock = threading.RLock()
+        self.db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def append(self, records):
+        """Запись прогонов одной транзакцией → число записанных"""
+        count = 0
+        with self.lock, self.db:
+            for record in records:
+                data = record["report"]
+                result = report.Report.from_dict(data)
+                blob = zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+                run_id = self.db.execute(
+                    "INSERT INTO runs (student, commit_sha, graded_at, passed, structure_ok,"
+                    " linters_total, report) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (record["student"], record["commit"], record["graded_at"],
+                     result.exit_code == 0, result.structure_ok, result.linters_total, blob),
+                ).lastrowid
+                self.db.executemany(
+                    "INSERT INTO files (run_id, file, state) VALUES (?, ?, ?)",
+                    ((run_id, f.name, f.state) for f in result.files),
+                )
+                self.db.executemany(
+                    "INSERT INTO diagnostics (run_id, file, tool, code, line, col, weight, message)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    ((run_id, *row) for row in record["diagnostics"]),
+                )
+                count += 1
+        return count
+
+    # === ОТЧЁТЫ СТУДЕНТА (только его строки, по индексу runs_student) ===
+
+    def student_report(self, student, commit=None):
+        """report.Report последнего прогона студента (или прогона коммита) или None"""
+        query = "SELECT report FROM runs WHERE student = ?"
+        params = [student]
+        if commit:
+            query += " AND commit_sha LIKE ?"
+            params.append(commit + "%")
+        with self.lock:
+            row = self.db.execute(query + " ORDER BY id DESC LIMIT 1", params).fetchone()
+        if row is None:
+            return None
+        return report.Report.from_dict(json.loads(zlib.decompress(row[0])))
+
+    def history(self, student):
+        """Прогоны студента: [(коммит, время, зачёт, баллы линтеров)] от старых к новым"""
+        with self.lock:
+            return self.db.execute(
+                "SELECT commit_sha, graded_at, passed, linters_total FROM runs"
+                " WHERE student = ? ORDER BY id", (student,)
+            ).fetchall()
+
+    # === АГРЕГАТЫ ПО ГРУППЕ ===
+
+    @staticmethod
+    def _runs(all_runs):
+        return "runs" if all_runs else "latest_runs"
+
+    def top_codes(self, tool=None, limit=10, scored=False, all_runs=False):
+        """Самые частые коды замечаний: [(линтер, код, замечаний, студентов)]
+
+        По умолчанию — по последним прогонам студентов; scored — только коды,
+        влияющие на баллы.
+        """
+        where, params = [], []
+        if tool:
+            where.append("d.tool = ?")
+            params.append(tool)
+        if scored:
+            where.append("d.weight > 0")
+        query = (f"SELECT d.tool, d.code, COUNT(*), COUNT(DISTINCT r.student)"
+                 f" FROM diagnostics d JOIN {self._runs(all_runs)} r ON r.id = d.run_id"
+                 f"{' WHERE ' + ' AND '.join(where) if where else ''}"
+                 f" GROUP BY d.tool, d.code ORDER BY 3 DESC, 1, 2 LIMIT ?")
+        with self.lock:
+            return self.db.execute(query, params + [limit]).fetchall()
+
+    def pass_rates(self, all_runs=False):
+        """Доля зачтённых по файлам задания: [(файл, прогонов, пройдено, доля)]"""
+        with self.lock:
+            rows = self.db.execute(
+                f"SELECT f.file, COUNT(*), SUM(f.state = 'passed')"
+                f" FROM files f JOIN {self._runs(all_runs)} r ON r.id = f.run_id"
+                f" GROUP BY f.file ORDER BY f.file"
+            ).fetchall()
+        return [(fname, total, passed, passed / total) for fname, total, passed in rows]
+
+    def score_distribution(self):
+        """Распределение баллов линтеров по дням: [(день, баллы, прогонов)]"""
+        with self.lock:
+            return self.db.execute(
+                "SELECT date(graded_at, 'unixepoch', 'localtime') AS day, linters_total, COUNT(*)"
+                " FROM runs WHERE linters_total IS NOT NULL"
+                " GROUP BY day, linters_total ORDER BY day, linters_total"
+            ).fetchall()
+
+    # === ВЫГРУЗКА ===
+
+    def export(self, table, out, fmt="jsonl"):
+        """Построчная выгрузка таблицы в out (jsonl или csv) → число строк"""
+        count = 0
+        with self.lock:
+            cursor = self.db.execute(EXPORTS[table])
+            columns = [c[0] for c in cursor.description]
+            writer = None
+            if fmt == "csv":
+                writer = csv.writer(out)
+                writer.writerow(columns)
+            while True:
+                rows = cursor.fetchmany(EXPORT_BATCH)
+                if not rows:
+                    break
+                for row in rows:
+                    if writer is not None:
+                        writer.writerow(row)
+                    else:
+                        out.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n")
+                count += len(rows)
+        return count
+
+    def close(self):
+        self.db.close()
+
+def _print_stats(store, args):
+    print("## Самые частые замечания\n")
+    print("| Линтер | Код | Замечаний | Студентов |")
+    print("|--------|-----|-----------|-----------|")
+    for tool, code, count, students in store.top_codes(args.tool, args.limit, args.scored,
+                                                       args.all_runs):
+        print(f"| {tool} | `{code}` | {count} | {students} |")
+    print("\n## Зачтено по файлам\n")
+    print("| Файл | Пройдено | Доля |")
+    print("|------|----------|------|")
+    for fname, total, passed, rate in store.pass_rates(args.all_runs):
+        print(f"| `{fname}` | {passed}/{total} | {rate:.0%} |")
+    print("\n## Баллы линтеров по дням\n")
+    print("| День | Баллы | Прогонов |")
+    print("|------|-------|----------|")
+    for day, total, count in store.score_distribution():
+        print(f"| {day} | {total}/20 | {count} |")
+
+def main():
+    parser = argparse.ArgumentParser(description="Аналитика результатов проверок группы")
+    parser.add_argument("db", help="файл хранилища (reports/results.sqlite3)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    stats_parser = sub.add_parser("stats", help="агрегаты по группе")
+    stats_parser.add_argument("--tool", choices=report.LINTERS, help="только этот линтер")
+    stats_parser.add_argument("--limit", type=int, default=10, help="сколько кодов показать")
+    stats_parser.add_argument("--scored", action="store_true", help="только коды, снижающие баллы")
+    stats_parser.add_argument("--all-runs", action="store_true",
+                              help="по всем прогонам, а не по последним")
+    report_parser = sub.add_parser("report", help="отчёт студента из хранилища")
+    report_parser.add_argument("student")
+    report_parser.add_argument("--commit", help="прогон коммита (можно префикс хэша)")
+    report_parser.add_argument("--format", choices=["markdown", "json"], default="markdown")
+    history_parser = sub.add_parser("history", help="прогоны студента")
+    history_parser.add_argument("student")
+    export_parser = sub.add_parser("export", help="выгрузка таблицы в stdout")
+    export_parser.add_argument("table", choices=list(EXPORTS))
+    export_parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+    try:
+        if args.command == "stats":
+            _print_stats(store, args)
+        elif args.command == "report":
+            result = store.student_report(args.student, args.commit)
+            if result is None:
+                print(f"❌ Нет прогонов студента {args.student}", file=sys.stderr)
+                return 1
+            report.RENDERERS[args.format](result, sys.stdout)
+        elif args.command == "history":
+            for commit, graded_at, passed, total in store.history(args.student):
+                when = time.strftime("%Y-%m-%d %H:%M", time.localtime(graded_at))
+                linters = "—" if total is None else f"{total}/20"
+                print(f"{'✅' if passed else '❌'} {when} {(commit or '—')[:12]} {linters}")
+        else:
+            store.export(args.table, sys.stdout, args.format)
+    finally:
+        store.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""Необязательный этап: реальный запуск скриптов you_playwright/*.py
+
+Статическая проверка не видит, выводит ли скрипт заголовок на самом деле.
+Этот этап выполняет каждый скрипт и сверяет его вывод с ожидаемым:
+
+- внешние сайты (demoqa.com, github.com, apple.com, httpbin.org/user-agent)
+  подменяются локальным HTTP-сервером с фикстурами, сеть не нужна;
+- на каждый движок запускается ОДИН долгоживущий браузер, а скрипту вместо
+  настоящего sync_playwright() отдаётся обёртка: p.<браузер>.launch()
+  возвращает изолированный контекст общего браузера, а browser.close()
+  закрывает только этот контекст;
+- для каждого скрипта записываются задержка и число вызовов launch(),
+  для всего этапа — сколько браузеров было запущено на самом деле.
+
+Скрипты выполняются в отдельном процессе с урезанным окружением
+(run_in_sandbox), чтобы код студента не влиял на процесс проверки.
+
+    python tools/runtime_check.py path/to/work [path/to/other_work ...]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import runpy
+import signal
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import limits
+import task_spec
+
+SCRIPT_TIMEOUT = 60  # секунд на один скрипт
+
+# Страницы-заглушки: хост → путь → (content-type, тело)
+FIXTURE_PAGES = {
+    "demoqa.com": {"/": ("text/html", "<html><head><title>DEMOQA</title></head><body>ToolsQA</body></html>")},
+    "github.com": {"/": ("text/html", "<html><head><title>GitHub</title></head><body>GitHub</body></html>")},
+    "apple.com": {"/": ("text/html", "<html><head><title>Apple</title></head><body>Apple</body></html>")},
+}
+USER_AGENT_HOST = "httpbin.org"
+
+TASK = task_spec.load()
+# Что должен сделать каждый скрипт при запуске (раздел runtime в task_spec.json)
+EXPECTATIONS = TASK.expectations
+
+class ScriptTimeout(Exception):
+    """Скрипт не уложился в SCRIPT_TIMEOUT"""
+
+# === Локальный сервер фикстур ===
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Отдаёт /<хост>/<путь> из FIXTURE_PAGES; /httpbin.org/user-agent — как httpbin"""
+
+    def do_GET(self):
+        host, _, path = self.path.lstrip("/").partition("/")
+        path = "/" + path.split("?", 1)[0]
+        if host == USER_AGENT_HOST and path == "/user-agent":
+            user_agent = self.headers.get("User-Agent", "")
+            self.server.user_agents.append(user_agent)
+            body = json.dumps({"user-agent": user_agent}, indent=2)
+            self._send(200, "application/json", body)
+            return
+        page = FIXTURE_PAGES.get(host, {}).get(path)
+        if page is None:
+            self._send(404, "text/plain", "not found")
+        else:
+            self._send(200, *page)
+
+    def _send(self, status, content_type, body):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *_):
+        pass
+
+class FixtureServer:
+    """Локальный HTTP-сервер с фикстурами в фоновом потоке"""
+
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+        self.httpd.user_agents = []
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def user_agents(self):
+        return self.httpd.user_agents
+
+    def local_url(self, url):
+        """Адрес фикстуры для внешнего URL или None, если хост не подменяется"""
+        parts = urlsplit(url)
+        host = (parts.hostname or "").removeprefix("www.")
+        if host not in FIXTURE_PAGES and host != USER_AGENT_HOST:
+            return None
+        return f"{self.base_url}/{host}{parts.path or '/'}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+# === Общие браузеры и обёртки для скриптов ===
+
+class BrowserPool:
+    """По одному браузеру на движок на всё время этапа"""
+
+    def __init__(self, server):
+        self.server = server
+        self.manager = None
+        self.playwright = None
+        self.browsers = {}
+        self.launches = {}
+
+    def start(self):
+        from playwright.sync_api import sync_playwright
+        self.manager = sync_playwright()
+        self.playwright = self.manager.start()
+
+    def browser(self, engine):
+        browser = self.browsers.get(engine)
+        if browser is None or not browser.is_connected():
+            browser = getattr(self.playwright, engine).launch(headless=True)
+            self.browsers[engine] = browser
+            self.launches[engine] = self.launches.get(engine, 0) + 1
+        return browser
+
+    def route(self, route):
+        """Перенаправление запросов к внешним сайтам на сервер фикстур"""
+        local = self.server.local_url(route.request.url)
+        if local is None:
+            route.abort()
+            return
+        route.fulfill(response=route.fetch(url=local))
+
+    def reset(self):
+        """Перезапуск после сбоя скрипта (например, таймаута посреди вызова)"""
+        self.stop()
+        self.start()
+
+    def stop(self):
+        for browser in self.browsers.values():
+            with contextlib.suppress(Exception):
+                browser.close()
+        self.browsers.clear()
+        if self.manager is not None:
+            with contextlib.suppress(Exception):
+                self.manager.__exit__(None, None, None)
+            self.manager = self.playwright = None
+
+class ScriptRun:
+    """Всё, что скрипт открыл через обёртки: вызовы launch и контексты"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.launch_calls = []
+        self.contexts = []
+        self.viewports = []
+
+    def new_context(self, engine, **kwargs):
+        context = self.pool.browser(engine).new_context(**kwargs)
+        context.route("**/*", self.pool.route)
+        self.contexts.append(context)
+        return context
+
+    def close_context(self, context):
+        for page in context.pages:
+            if page.viewport_size:
+                self.viewports.append(page.viewport_size)
+        with contextlib.suppress(Exception):
+            context.close()
+
+    def close(self):
+        for context in self.contexts:
+            self.close_context(context)
+        self.contexts.clear()
+
+class BrowserProxy:
+    """То, что скрипт получает из launch(): общий браузер, но свои контексты"""
+
+    def __init__(self, run, engine):
+        self._run = run
+        self._engine = engine
+        self._contexts = []
+
+    def new_context(self, **kwargs):
+        context = self._run.new_context(self._engine, **kwargs)
+        self._contexts.append(context)
+        return context
+
+    def new_page(self, **kwargs):
+        return self.new_context(**kwargs).new_page()
+
+    @property
+    def contexts(self):
+        return list(self._contexts)
+
+    def close(self, **_):
+        for context in self._contexts:
+            self._run.close_context(context)
+        self._contexts.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __getattr__(self, name):
+        return getattr(self._run.pool.browser(self._engine), name)
+
+class BrowserTypeProxy:
+    """p.chromium / p.firefox / p.webkit для скрипта"""
+
+    def __init__(self, run, engine):
+        self._run = run
+        self.name = engine
+
+    def launch(self, **kwargs):
+        self._run.launch_calls.append({"browser": self.name, "kwargs": {
+            key: value for key, value in kwargs.items()
+            if isinstance(value, (bool, int, float, str, type(None)))
+        }})
+        return BrowserProxy(self._run, self.name)
+
+    def __getattr__(self, name):
+        return getattr(getattr(self._run.pool.playwright, self.name), name)
+
+class PlaywrightProxy:
+    """Замена sync_playwright() на время выполнения скрипта"""
+
+    def __init__(self, run):
+        self._run = run
+        self.chromium = BrowserTypeProxy(run, "chromium")
+        self.firefox = BrowserTypeProxy(run, "firefox")
+        self.webkit = BrowserTypeProxy(run, "webkit")
+
+    def start(self):
+        return self
+
+    def stop(self):
+        self._run.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def __getattr__(self, name):
+        return getattr(self._run.pool.playwright, name)
+
+@contextlib.contextmanager
+def patched_playwright(run):
+    """Подмена playwright.sync_api.sync_playwright обёрткой над общим пулом"""
+    import playwright.sync_api as sync_api
+    original = sync_api.sync_playwright
+    sync_api.sync_playwright = lambda: PlaywrightProxy(run)
+    try:
+        yield
+    finally:
+        sync_api.sync_playwright = original
+
+@contextlib.contextmanager
+def time_limit(seconds):
+    def on_alarm(*_):
+        raise ScriptTimeout(f"скрипт выполнялся дольше {seconds} с")
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+@contextlib.contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+def evaluate(fname, stdout, run, server):
+    """Сверка вывода скрипта с ожиданиями: список проблем"""
+    expected = EXPECTATIONS[fname]
+    problems = []
+    if not any(call["browser"] == expected["browser"] for call in run.launch_calls):
+        problems.append(f"не запущен {expected['browser']}")
+    if "title" in expected and expected["title"] not in stdout:
+        problems.append(f"не выведен заголовок страницы «{expected['title']}»")
+    if expected.get("user_agent") and not any(ua and ua in stdout for ua in server.user_agents):
+        problems.append("не выведен User-Agent")
+    if expected.get("viewport") and not any(
+        str(size["width"]) in stdout and str(size["height"]) in stdout for size in run.viewports
+    ):
+        problems.append("не выведен размер viewport")
+    if "url" in expected and expected["url"] not in stdout:
+        problems.append("не выведен URL страницы")
+    return problems
+
+def run_script(path, pool, server, timeout=SCRIPT_TIMEOUT):
+    """Выполнение одного скрипта с перехватом вывода"""
+    run = ScriptRun(pool)
+    stdout = io.StringIO()
+    error = None
+    del server.user_agents[:]
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(stdout), patched_playwright(run), \
+                working_directory(path.parent), time_limit(timeout):
+            runpy.run_path(str(path), run_name="__main__")
+    except SystemExit:
+        pass
+    except ScriptTimeout as e:
+        error = str(e)
+        pool.reset()
+    except Exception as e:
+        message = str(e).strip().splitlines()
+        error = f"{type(e).__name__}: {message[0] if message else ''}"
+    finally:
+        run.close()
+    seconds = time.perf_counter() - started
+
+    output = stdout.getvalue()
+    problems = [error] if error else []
+    problems += evaluate(path.name, output, run, server)
+    return {
+        "passed": not problems,
+        "problems": problems,
+        "seconds": round(seconds, 3),
+        "launch_calls": run.launch_calls,
+        "stdout": output[-2000:],
+    }
+
+def run_stage(roots, timeout=SCRIPT_TIMEOUT):
+    """Запуск скриптов всех работ на общем пуле браузеров"""
+    results = {}
+    with FixtureServer() as server:
+        pool = BrowserPool(server)
+        pool.start()
+        try:
+            for root in roots:
+                project = Path(root).resolve() / TASK.project_dir
+                files = {}
+                for fname in EXPECTATIONS:
+                    path = project / fname
+                    if not path.is_file():
+                        files[fname] = {"passed": False, "problems": ["файл не найден"],
+                                        "seconds": 0.0, "launch_calls": [], "stdout": ""}
+                        continue
+                    files[fname] = run_script(path, pool, server, timeout)
+                results[str(root)] = files
+        finally:
+            pool.stop()
+    return {"browser_launches": pool.launches, "works": results}
+
+def run_in_sandbox(roots, timeout=SCRIPT_TIMEOUT):
+    """Этап в отдельном процессе с минимальным окружением
+
+    Результат возвращается через отдельный файл, а не stdout: код студента
+    выполняется в том же процессе и может писать прямо в дескриптор 1
+    (subprocess, os.system, sys.__stdout__).
+    """
+    env = {key: os.environ[key] for key in ("PATH", "HOME", "LANG", "PLAYWRIGHT_BROWSERS_PATH",
+                                            "GRADER_TASK_SPEC")
+           if key in os.environ}
+    with tempfile.TemporaryDirectory(prefix="grader-runtime-") as directory:
+        result_path = os.path.join(directory, "result.json")
+        result = limits.run(
+            [sys.executable, os.path.abspath(__file__), "--result-file", result_path,
+             "--timeout", str(timeout)] + [str(root) for root in roots],
+            "runtime",
+            env=env,
+            timeout=timeout * len(EXPECTATIONS) * max(1, len(roots)) + 60,
+        )
+        exceeded = limits.exceeded("runtime", result.returncode, result.stderr)
+        if exceeded is not None:
+            raise limits.LimitExceeded(f"превышен лимит — {exceeded}")
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip()
+                               else f"код выхода {result.returncode}")
+        with open(result_path, encoding="utf-8") as f:
+            return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Запуск скриптов Playwright с проверкой вывода")
+    parser.add_argument("roots", nargs="*", default=["."], help="каталоги работ")
+    parser.add_argument("--timeout", type=float, default=SCRIPT_TIMEOUT, help="секунд на скрипт")
+    parser.add_argument("--json", action="store_true", help="вывод результата в JSON")
+    parser.add_argument("--result-file", help="записать результат в JSON-файл (run_in_sandbox)")
+    args = parser.parse_args()
+
+    results = run_stage(args.roots, args.timeout)
+    if args.result_file:
+        with open(args.result_file, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False)
+        return 0
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False))
+        return 0
+
+    for root, files in results["works"].items():
+        print(f"📁 {root}")
+        for fname, data in files.items():
+            mark = "✅" if data["passed"] else "❌"
+            print(f"   {mark} {fname} ({data['seconds']} с, launch(): {len(data['launch_calls'])})")
+            for problem in data["problems"]:
+                print(f"      - {problem}")
+    launches = ", ".join(f"{engine}: {count}" for engine, count in results["browser_launches"].items())
+    print(f"🌐 Запусков браузеров: {launches or 'нет'}")
+    return 0 if all(d["passed"] for files in results["works"].values() for d in files.values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
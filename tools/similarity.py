@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""Индекс похожести работ группы (поиск списывания)
+
+Каждый файл задания превращается в последовательность нормализованных
+токенов AST: имена переменных и значения литералов стираются, остаются типы
+узлов и имена атрибутов (методы Playwright). Из k-грамм токенов строится
+сигнатура MinHash; сигнатура работы — поэлементный минимум сигнатур её
+файлов (MinHash объединения множеств). LSH раскладывает сигнатуры по
+корзинам полос, так что сравниваются только работы, совпавшие хотя бы в одной
+полосе, а не все пары. Пары с оценкой сходства Жаккара не ниже порога
+объединяются в кластеры.
+
+Общий для всех код (заготовка задания, эталонное решение) можно передать
+как шаблон: его k-граммы исключаются до MinHash, иначе все работы, близкие
+к заготовке, окажутся в одном кластере.
+
+AST берётся из analysis_cache (тот же разбор, что у этапа синтаксиса),
+сигнатуры файлов — из дискового кэша по хэшу содержимого. Индекс хранится
+в JSON и обновляется по одной работе: пересчитываются только изменённые файлы.
+
+    python tools/similarity.py submissions/ --index similarity.json
+    python tools/similarity.py submissions/ --template solution/
+    python tools/similarity.py submissions/alice --index similarity.json --name alice
+"""
+import argparse
+import ast
+import hashlib
+import json
+import random
+import sys
+from pathlib import Path
+
+import analysis_cache
+import result_cache
+import task_spec
+import timing
+
+SHINGLE = 5        # токенов в k-грамме
+NUM_PERM = 64      # хэш-функций MinHash
+BANDS = 16         # полос LSH (по NUM_PERM // BANDS значений в полосе)
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.8    # оценка сходства Жаккара, начиная с которой работы похожи
+SEED = 20240917
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(SEED)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+TASK = task_spec.load()
+
+# === СИГНАТУРЫ ===
+
+def _token(node):
+    if isinstance(node, ast.Attribute):
+        return "Attribute." + node.attr
+    if isinstance(node, ast.Constant):
+        return "Constant." + type(node.value).__name__
+    if isinstance(node, ast.keyword):
+        return f"keyword.{node.arg}"
+    return type(node).__name__
+
+def normalized_tokens(tree):
+    """Обход AST в прямом порядке без имён переменных и значений литералов"""
+    tokens = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.expr_context):
+            continue
+        tokens.append(_token(node))
+        stack.extend(reversed(list(ast.iter_child_nodes(node))))
+    return tokens
+
+def shingles(tokens, prefix=""):
+    """64-битные хэши k-грамм токенов (prefix отделяет разные файлы задания)"""
+    if len(tokens) < SHINGLE:
+        tokens = tokens + [""] * (SHINGLE - len(tokens))
+    return {
+        int.from_bytes(hashlib.blake2b(
+            "\0".join([prefix] + tokens[i:i + SHINGLE]).encode("utf-8"), digest_size=8
+        ).digest(), "big")
+        for i in range(len(tokens) - SHINGLE + 1)
+    }
+
+def minhash(hashes):
+    """Сигнатура MinHash множества хэшей"""
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+def combine(signatures):
+    """Сигнатура объединения множеств — поэлементный минимум"""
+    return [min(values) for values in zip(*signatures)]
+
+def file_shingles(analysis, fname):
+    """k-граммы файла или None, если он не разбирается"""
+    try:
+        return shingles(normalized_tokens(analysis.tree), fname)
+    except (SyntaxError, UnicodeDecodeError):
+        return None
+
+class Template:
+    """k-граммы общего кода по файлам задания (исключаются из сигнатур)"""
+
+    def __init__(self, root=None):
+        self.shingles = {}
+        digests = []
+        if root is not None:
+            project = Path(root) / TASK.project_dir
+            for fname in TASK.file_names:
+                try:
+                    analysis = analysis_cache.analyze(project / fname)
+                except (OSError, UnicodeDecodeError):
+                    continue
+                found = file_shingles(analysis, fname)
+                if found:
+                    self.shingles[fname] = found
+                    digests.append(f"{fname}:{analysis.digest}")
+        self.digest = hashlib.sha256("\0".join(digests).encode("utf-8")).hexdigest()
+
+NO_TEMPLATE = Template()
+
+def signature_version(template=NO_TEMPLATE):
+    return result_cache.checker_version(
+        Path(__file__).resolve(), f"{SHINGLE} {NUM_PERM} {SEED}", template.digest
+    )
+
+_memo = result_cache.MemoryCache()  # (файл задания, SHA-256, шаблон) → сигнатура или None
+
+def file_signature(path, fname, cache=None, template=NO_TEMPLATE):
+    """(SHA-256, сигнатура) файла; сигнатура None, если файл не разбирается
+    или целиком совпадает с шаблоном
+
+    Отсутствующий или нечитаемый файл даёт (None, None).
+    """
+    try:
+        analysis = analysis_cache.analyze(path)
+    except (OSError, UnicodeDecodeError):
+        return None, None
+    key = (fname, analysis.digest, template.digest)
+    if key in _memo:
+        return analysis.digest, _memo[key]
+    cache_digest = f"{fname}:{analysis.digest}"
+    version = signature_version(template)
+    entry = cache.get("minhash", cache_digest, version) if cache else None
+    if entry is None:
+        with timing.span("similarity.minhash"):
+            found = file_shingles(analysis, fname)
+            if found is not None:
+                found -= template.shingles.get(fname, set())
+            signature = minhash(found) if found else None
+        entry = {"signature": signature}
+        if cache:
+            cache.put("minhash", cache_digest, version, entry)
+    _memo[key] = entry["signature"]
+    return analysis.digest, entry["signature"]
+
+def submission_signatures(root, cache=None, template=NO_TEMPLATE):
+    """{файл задания: [SHA-256, сигнатура]} для работы в каталоге root"""
+    cache = cache if cache is not None else result_cache.default_cache()
+    project = Path(root) / TASK.project_dir
+    files = {}
+    for fname in TASK.file_names:
+        digest, signature = file_signature(project / fname, fname, cache, template)
+        if signature is not None:
+            files[fname] = [digest, signature]
+    return files
+
+# === ИНДЕКС ===
+
+class SimilarityIndex:
+    """Сигнатуры работ и корзины LSH с пополнением по одной работе"""
+
+    def __init__(self, threshold=THRESHOLD, template=NO_TEMPLATE):
+        self.threshold = threshold
+        self.template = template
+        self.students = {}  # студент → {"files": {файл: [хэш, сигнатура]}, "signature": [...]}
+        self.buckets = {}   # (полоса, значения полосы) → множество студентов
+
+    @staticmethod
+    def _bands(signature):
+        for band in range(BANDS):
+            yield (band, tuple(signature[band * ROWS:(band + 1) * ROWS]))
+
+    def remove(self, student):
+        entry = self.students.pop(student, None)
+        if entry is None:
+            return
+        for key in self._bands(entry["signature"]):
+            members = self.buckets.get(key)
+            if members is not None:
+                members.discard(student)
+                if not members:
+                    del self.buckets[key]
+
+    def update(self, student, files):
+        """Добавление или замена работы; False, если её файлы не изменились"""
+        previous = self.students.get(student)
+        digests = {fname: data[0] for fname, data in files.items()}
+        if previous is not None and digests == {f: d[0] for f, d in previous["files"].items()}:
+            return False
+        self.remove(student)
+        if not files:
+            return True
+        signature = combine([data[1] for data in files.values()])
+        self.students[student] = {"files": files, "signature": signature}
+        for key in self._bands(signature):
+            self.buckets.setdefault(key, set()).add(student)
+        return True
+
+    def similarity(self, a, b):
+        """Оценка сходства Жаккара по доле совпавших значений сигнатур"""
+        sa, sb = self.students[a]["signature"], self.students[b]["signature"]
+        return sum(x == y for x, y in zip(sa, sb)) / NUM_PERM
+
+    def query(self, student):
+        """Похожие на студента работы: [(студент, сходство)] по убыванию"""
+        entry = self.students.get(student)
+        if entry is None:
+            return []
+        candidates = set()
+        for key in self._bands(entry["signature"]):
+            candidates |= self.buckets.get(key, set())
+        candidates.discard(student)
+        found = [(other, self.similarity(student, other)) for other in candidates]
+        return sorted((pair for pair in found if pair[1] >= self.threshold),
+                      key=lambda pair: (-pair[1], pair[0]))
+
+    def pairs(self):
+        """Похожие пары работ (кандидаты — только из общих корзин LSH)"""
+        candidates = set()
+        for members in self.buckets.values():
+            if len(members) > 1:
+                ordered = sorted(members)
+                for i, a in enumerate(ordered):
+                    for b in ordered[i + 1:]:
+                        candidates.add((a, b))
+        result = []
+        for a, b in candidates:
+            score = self.similarity(a, b)
+            if score >= self.threshold:
+                result.append((a, b, score))
+        return sorted(result, key=lambda pair: (-pair[2], pair[0], pair[1]))
+
+    def clusters(self):
+        """Группы похожих работ: [{"students": [...], "similarity": макс. сходство}]"""
+        parent = {}
+
+        def find(x):
+            while parent.setdefault(x, x) != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        pairs = self.pairs()
+        for a, b, _ in pairs:
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[rb] = ra
+        best = {}
+        for a, _, score in pairs:
+            root = find(a)
+            best[root] = max(best.get(root, 0.0), score)
+        groups = {}
+        for student in parent:
+            groups.setdefault(find(student), []).append(student)
+        return sorted(
+            ({"students": sorted(members), "similarity": round(best[root], 3)}
+             for root, members in groups.items() if len(members) > 1),
+            key=lambda cluster: (-cluster["similarity"], cluster["students"]),
+        )
+
+    def save(self, path):
+        data = {
+            "version": signature_version(self.template),
+            "threshold": self.threshold,
+            "students": self.students,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path, threshold=None, template=NO_TEMPLATE):
+        """Индекс из файла; пустой, если файла нет или сигнатуры устарели
+        (изменились параметры, код модуля или шаблон)"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = None
+        index = cls(threshold if threshold is not None
+                    else (data or {}).get("threshold", THRESHOLD), template)
+        if data and data.get("version") == signature_version(template):
+            for student, entry in data["students"].items():
+                index.update(student, entry["files"])
+        return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Поиск похожих работ группы")
+    parser.add_argument("path", help="каталог с работами или одна работа (с --name)")
+    parser.add_argument("--index", default="similarity.json", help="файл индекса")
+    parser.add_argument("--name", help="добавить одну работу под этим именем")
+    parser.add_argument("--threshold", type=float, default=None, help="порог сходства (0..1)")
+    parser.add_argument("--template", help="работа с общим кодом (заготовка или эталон)")
+    args = parser.parse_args()
+
+    template = Template(args.template) if args.template else NO_TEMPLATE
+    index = SimilarityIndex.load(args.index, args.threshold, template)
+    if args.name:
+        index.update(args.name, submission_signatures(args.path, template=template))
+        index.save(args.index)
+        for other, score in index.query(args.name):
+            print(f"🔎 {args.name} ~ {other}: {score:.0%}")
+        return 0
+
+    root = Path(args.path)
+    updated = 0
+    for entry in sorted(root.iterdir()):
+        if entry.is_dir() and not entry.name.startswith("."):
+            updated += index.update(entry.name, submission_signatures(entry, template=template))
+    index.save(args.index)
+    clusters = index.clusters()
+    print(f"📊 Работ в индексе: {len(index.students)}, пересчитано: {updated}")
+    for cluster in clusters:
+        print(f"🔎 {cluster['similarity']:.0%}: {', '.join(cluster['students'])}")
+    if not clusters:
+        print("✅ Похожих работ не найдено")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Запуск проверок tests/test_syntax.py в текущем процессе
+
+Вместо `python -m pytest -v` и разбора его вывода регулярками тестовые
+функции вызываются напрямую, а результат возвращается структурой.
+"""
+import importlib.util
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+import analysis_cache
+import ast_rules
+import limits
+import result_cache
+import task_spec
+import timing
+
+TESTS_DIR = Path(__file__).resolve().parent.parent / "tests"
+SYNTAX_TESTS = TESTS_DIR / "test_syntax.py"
+
+TASK = task_spec.load()
+# Префикс имени теста → проверяемый файл
+TEST_FILES = TASK.test_files
+TEST_NAME = re.compile(r"test_([a-z]+)_(\w+)")
+
+_module = None
+
+def load_syntax_tests():
+    """Однократная загрузка модуля с тестами синтаксиса"""
+    global _module
+    if _module is None:
+        spec = importlib.util.spec_from_file_location("test_syntax", SYNTAX_TESTS)
+        _module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_module)
+    return _module
+
+def collect_tests(module):
+    """Тестовые функции модуля в порядке объявления"""
+    return [
+        (name, func) for name, func in vars(module).items()
+        if name.startswith("test_") and callable(func)
+    ]
+
+def run_test(func):
+    """Вызов одной тестовой функции: (пройден, сообщение об ошибке)"""
+    try:
+        func()
+    except AssertionError as e:
+        return False, str(e) or "AssertionError"
+    except pytest.fail.Exception as e:
+        return False, e.msg
+    except Exception as e:
+        return False, f"{type(e).__name__}: {e}"
+    return True, None
+
+def syntax_version():
+    """Версия проверок синтаксиса для ключей дискового кэша"""
+    tools_dir = Path(__file__).resolve().parent
+    return result_cache.checker_version(
+        SYNTAX_TESTS, tools_dir / "ast_rules.py", tools_dir / "syntax_runner.py",
+        tools_dir / "task_spec.py", TASK.path
+    )
+
+def file_digest(path):
+    """SHA-256 файла или None, если его нельзя прочитать как текст"""
+    try:
+        return analysis_cache.analyze(path).digest
+    except (OSError, UnicodeDecodeError):
+        return None
+
+def file_findings(path):
+    """Факты AST по файлу (из кэша разбора — повторного обхода нет)"""
+    try:
+        return ast_rules.findings_for(analysis_cache.analyze(path)).as_dict()
+    except (OSError, SyntaxError, UnicodeDecodeError, RecursionError):
+        return None
+
+def file_limit(path):
+    """Сообщение о превышенном лимите файла (размер, вложенность) или None"""
+    try:
+        analysis_cache.analyze(path).tree
+    except limits.LimitExceeded as e:
+        return str(e)
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        pass
+    return None
+
+def run_tests(tests):
+    """Прогон набора тестов: {тест: {"passed": ..., "message": ...}}"""
+    results = {}
+    for name, func in tests:
+        with timing.span(f"syntax.{name}"):
+            passed, message = run_test(func)
+        results[name] = {"passed": passed, "message": message}
+    return results
+
+def tests_by_file(module=None):
+    """Тесты по проверяемым файлам: {файл или None: [(имя, функция)]}"""
+    by_file = {}
+    for name, func in collect_tests(module or load_syntax_tests()):
+        match = TEST_NAME.fullmatch(name)
+        fname = TEST_FILES.get(match.group(1)) if match else None
+        by_file.setdefault(fname, []).append((name, func))
+    return by_file
+
+def missing_file(fname):
+    """Результат проверок отсутствующего файла без запуска его тестов
+
+    Те же записи, что дали бы сами тесты: все не пройдены с сообщением
+    parse_python_file() о ненайденном файле.
+    """
+    message = f"❌ Файл {fname} не найден"
+    return {
+        "file_status": {fname: False},
+        "tests": {name: {"file": fname, "passed": False, "message": message}
+                  for name, _ in tests_by_file().get(fname, [])},
+        "findings": {fname: None},
+        "limits": {},
+        "cached": [],
+    }
+
+def run_syntax_checks(root=None, cache=None, files=None):
+    """Проверка синтаксиса работы в каталоге root
+
+    Возвращает {"file_status": {файл: bool}, "tests": {тест: {...}},
+    "findings": {файл: факты AST или None}, "limits": {файл: превышенный
+    лимит (limits.py)}, "cached": [файлы из кэша]}.
+    Статус файла, как и раньше, определяется тестом test_<браузер>_syntax.
+    Результаты файлов, содержимое которых уже проверялось, берутся
+    из дискового кэша (result_cache) без повторного анализа.
+    files — проверить только эти файлы (режим наблюдения); тесты, не
+    привязанные к файлу, тогда не запускаются.
+    """
+    module = load_syntax_tests()
+    project = Path(root or ".") / TASK.project_dir
+    module.PROJECT_ROOT = project
+    cache = cache if cache is not None else result_cache.default_cache()
+    version = syntax_version()
+
+    by_file = tests_by_file(module)
+    file_status = {fname: False for fname in TEST_FILES.values()
+                   if files is None or fname in files}
+    tests, findings, file_limits, cached = {}, {}, {}, []
+    for fname, file_tests in by_file.items():
+        if files is not None and fname not in files:
+            continue
+        if fname is None:
+            for name, result in run_tests(file_tests).items():
+                tests[name] = {"file": None, **result}
+            continue
+
+        path = project / fname
+        digest = file_digest(path)
+        # Тесты и статус зависят от файла задания, а не только от содержимого:
+        # одинаковые run_chromium.py и run_firefox.py — разные записи
+        key = f"{fname}:{digest}" if digest else None
+        with timing.span("syntax.cache"):
+            entry = cache.get("syntax", key, version) if cache and key else None
+        if entry is not None:
+            cached.append(fname)
+        else:
+            entry = {"tests": run_tests(file_tests), "findings": file_findings(path),
+                     "limit": file_limit(path)}
+            if cache and key:
+                cache.put("syntax", key, version, entry)
+
+        findings[fname] = entry["findings"]
+        if entry["limit"] is not None:
+            file_limits[fname] = entry["limit"]
+        for name, result in entry["tests"].items():
+            tests[name] = {"file": fname, **result}
+            if TEST_NAME.fullmatch(name).group(2) == task_spec.STATUS_GROUP:
+                file_status[fname] = result["passed"]
+    return {"file_status": file_status, "tests": tests, "findings": findings,
+            "limits": file_limits, "cached": cached}
+
+def main():
+    results = run_syntax_checks(sys.argv[1] if len(sys.argv) > 1 else None)
+    for name, data in results["tests"].items():
+        mark = "✅" if data["passed"] else "❌"
+        print(f"{mark} {name}")
+        if data["message"]:
+            print(f"   {data['message']}")
+    return 0 if all(results["file_status"].values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
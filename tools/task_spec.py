@@ -0,0 +1,138 @@
+"""Описание задания (task_spec.json) и его компиляция в индекс правил
+
+Требования задания — файлы, импорты, вызовы, аргументы launch() и вывод —
+задаются один раз в JSON, а не в тестах, линтерах и генераторах отчёта по
+отдельности. При загрузке каждое правило превращается в готовый предикат над
+ast_rules.Findings, так что проверка файла — несколько поисков в множествах
+по уже собранным за один обход AST фактам, независимо от числа файлов.
+
+    {"name": "run_chromium.py", "tests": "chromium",
+     "checks": {"syntax": [{"import": "playwright.sync_api.sync_playwright"},
+                           {"launch": "chromium"}, {"prints": "title"}]},
+     "runtime": {"browser": "chromium", "title": "DEMOQA"}}
+
+Группа проверок <группа> файла с префиксом <tests> становится тестом
+test_<tests>_<группа> в tests/test_syntax.py; группа syntax определяет
+статус файла в отчёте. Другое задание подключается через GRADER_TASK_SPEC.
+"""
+import json
+import os
+from pathlib import Path
+
+import ast_rules
+
+SPEC_PATH = Path(os.getenv("GRADER_TASK_SPEC", Path(__file__).resolve().parent / "task_spec.json"))
+STATUS_GROUP = "syntax"  # группа, по которой определяется статус файла
+
+PRINT_MESSAGES = {
+    ast_rules.TITLE: "❌ Не обнаружен вывод заголовка страницы через print()",
+    ast_rules.USER_AGENT: "❌ Не обнаружен вывод User-Agent",
+    ast_rules.VIEWPORT: "❌ Не обнаружен вывод размера viewport (ширина/высота)",
+    ast_rules.URL: "❌ Не обнаружен вывод текущего URL страницы",
+}
+
+class Rule:
+    """Скомпилированное требование: предикат над Findings и сообщение об ошибке"""
+    __slots__ = ("kind", "check", "message")
+
+    def __init__(self, kind, check, message):
+        self.kind = kind
+        self.check = check
+        self.message = message
+
+def _launch_kwargs(expected):
+    def check(findings):
+        return any(
+            all(_same(launch.kwargs.get(key), value) for key, value in expected.items())
+            for launch in findings.launches
+        )
+    return check
+
+def _same(actual, expected):
+    # True/False сравниваются по идентичности: headless=1 не считается headless=True
+    if isinstance(expected, bool):
+        return actual is expected
+    return actual == expected
+
+def compile_rule(data):
+    """Правило из JSON → Rule; неизвестный вид правила — ValueError"""
+    message = data.get("message")
+    if "import" in data:
+        module, _, name = data["import"].rpartition(".")
+        key = (module, name)
+        return Rule("import", lambda f: key in f.imports,
+                    message or f"❌ Отсутствует импорт {name} из {module}")
+    if "launch" in data:
+        browser = data["launch"]
+        if browser not in ast_rules.BROWSERS:
+            raise ValueError(f"неизвестный браузер: {browser}")
+        return Rule("launch", lambda f: f.launches_browser(browser),
+                    message or f"❌ Не найден запуск браузера: p.{browser}.launch()")
+    if "launch_kwargs" in data:
+        expected = dict(data["launch_kwargs"])
+        shown = ", ".join(f"{key}={value!r}" for key, value in expected.items())
+        return Rule("launch_kwargs", _launch_kwargs(expected),
+                    message or f"❌ Не найден вызов launch({shown})")
+    if "call" in data:
+        name = data["call"]
+        return Rule("call", lambda f: name in f.calls,
+                    message or f"❌ Не найден вызов {name}()")
+    if "prints" in data:
+        category = data["prints"]
+        if category not in PRINT_MESSAGES:
+            raise ValueError(f"неизвестная категория вывода: {category}")
+        return Rule("prints", lambda f: f.prints(category),
+                    message or PRINT_MESSAGES[category])
+    raise ValueError(f"неизвестное правило: {data}")
+
+class FileSpec:
+    """Файл задания: префикс тестов, группы правил и ожидания при запуске"""
+    __slots__ = ("name", "prefix", "groups", "runtime")
+
+    def __init__(self, name, prefix, groups, runtime):
+        self.name = name
+        self.prefix = prefix
+        self.groups = groups    # группа → [Rule]
+        self.runtime = runtime  # ожидания runtime_check или None
+
+class TaskSpec:
+    """Скомпилированное задание с индексами, общими для всех этапов"""
+
+    def __init__(self, title, project_dir, files, path=None):
+        self.title = title
+        self.project_dir = project_dir
+        self.files = files
+        self.path = path
+        self.file_names = [f.name for f in files]
+        self.scripts = [f"{project_dir}/{f.name}" for f in files]
+        self.test_files = {f.prefix: f.name for f in files}
+        self.expectations = {f.name: f.runtime for f in files if f.runtime}
+        self.runtime_browsers = list(dict.fromkeys(
+            expected["browser"] for expected in self.expectations.values()
+        ))
+
+def compile_spec(data, path=None):
+    """JSON-описание → TaskSpec (все правила компилируются здесь, один раз)"""
+    files = []
+    for entry in data["files"]:
+        groups = {
+            group: [compile_rule(rule) for rule in rules]
+            for group, rules in entry.get("checks", {}).items()
+        }
+        files.append(FileSpec(entry["name"], entry["tests"], groups, entry.get("runtime")))
+    prefixes = [f.prefix for f in files]
+    if len(set(prefixes)) != len(prefixes):
+        raise ValueError("префиксы тестов файлов должны быть уникальны")
+    return TaskSpec(data["title"], data["project_dir"], files, path)
+
+_loaded = {}  # путь → TaskSpec
+
+def load(path=None):
+    """Задание из файла (компиляция один раз на процесс)"""
+    path = Path(path or SPEC_PATH)
+    spec = _loaded.get(path)
+    if spec is None:
+        with open(path, encoding="utf-8") as f:
+            spec = compile_spec(json.load(f), path)
+        _loaded[path] = spec
+    return spec
@@ -0,0 +1,10 @@
+"""Тесты самих проверяющих скриптов (не входят в проверку работ: tests/)
+
+    python -m pytest tools/tests
+"""
+import sys
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
@@ -0,0 +1,24 @@
+"""Разобранные исходники в памяти (tools/analysis_cache.py)"""
+import threading
+
+import analysis_cache
+
+def test_parsed_source_is_shared_safely_between_threads():
+    parsed = analysis_cache.ParsedSource(("x = 1\n" * 20000).encode("utf-8"))
+    trees, errors = [], []
+
+    def parse():
+        try:
+            trees.append(parsed.tree("run_chromium.py"))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=parse) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len({id(tree) for tree in trees}) == 1
+    assert parsed.source.startswith("x = 1")
@@ -0,0 +1,102 @@
+"""Регрессии детектора фактов AST (tools/ast_rules.py)"""
+import ast
+import textwrap
+
+import ast_rules
+
+def scan(source):
+    return ast_rules.scan(ast.parse(textwrap.dedent(source)))
+
+def test_commented_headless_is_ignored():
+    findings = scan("""
+        with sync_playwright() as p:
+            # browser = p.chromium.launch(headless=True)
+            browser = p.chromium.launch()
+            print("headless=True")
+    """)
+    assert findings.launches_browser("chromium")
+    assert not findings.headless
+
+def test_headless_through_variable():
+    findings = scan("""
+        HEADLESS = True
+        with sync_playwright() as p:
+            browser = p.webkit.launch(headless=HEADLESS)
+    """)
+    assert findings.headless
+
+def test_headless_variable_reassigned():
+    findings = scan("""
+        headless = True
+        headless = get_mode()
+        browser = p.webkit.launch(headless=headless)
+    """)
+    assert not findings.headless
+
+def test_title_through_variable():
+    findings = scan("""
+        title = page.title()
+        message = f"Заголовок: {title}"
+        print(message)
+    """)
+    assert findings.prints(ast_rules.TITLE)
+
+def test_title_word_in_string_is_ignored():
+    findings = scan("""
+        print("title")  # page.title()
+    """)
+    assert not findings.prints(ast_rules.TITLE)
+
+def test_helper_defined_after_caller():
+    findings = scan("""
+        def main():
+            with sync_playwright() as p:
+                page = p.chromium.launch().new_page()
+                print(get_title(page))
+
+        def get_title(page):
+            return page.title()
+
+        main()
+    """)
+    assert findings.prints(ast_rules.TITLE)
+
+def test_helper_chain_defined_after_caller():
+    findings = scan("""
+        def main():
+            print(describe(page))
+
+        def describe(page):
+            return "Заголовок: " + get_title(page)
+
+        def get_title(page):
+            return page.title()
+    """)
+    assert findings.prints(ast_rules.TITLE)
+
+def test_lambda_helper():
+    findings = scan("""
+        get_agent = lambda page: page.evaluate("navigator.userAgent")
+        print(get_agent(page))
+    """)
+    assert findings.prints(ast_rules.USER_AGENT)
+
+def test_method_helper():
+    findings = scan("""
+        class Checker:
+            def run(self):
+                print(self.viewport())
+
+            def viewport(self):
+                return self.page.viewport_size
+    """)
+    assert findings.prints(ast_rules.VIEWPORT)
+
+def test_launch_through_attribute_chain():
+    findings = scan("""
+        class Runner:
+            def start(self):
+                self.browser = self.p.firefox.launch(headless=True)
+    """)
+    assert findings.launches_browser("firefox")
+    assert findings.headless
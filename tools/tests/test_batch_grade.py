@@ -0,0 +1,20 @@
+"""Пакетная проверка группы (tools/batch_grade.py)"""
+import pytest
+
+import batch_grade
+
+def test_manifest_resolves_paths_relative_to_itself(tmp_path):
+    manifest = tmp_path / "cohort.txt"
+    manifest.write_text("# группа 1\nalice\n\n/srv/bob\n", encoding="utf-8")
+
+    assert batch_grade.read_manifest(manifest) == [
+        ("alice", str(tmp_path / "alice")),
+        ("bob", "/srv/bob"),
+    ]
+
+def test_manifest_rejects_duplicate_student_names(tmp_path):
+    manifest = tmp_path / "cohort.txt"
+    manifest.write_text("group-a/ivanov\ngroup-b/ivanov\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="ivanov"):
+        batch_grade.read_manifest(manifest)
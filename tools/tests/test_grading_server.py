@@ -0,0 +1,65 @@
+"""Сервис проверки: процессы пула и распаковка архивов (tools/grading_server.py)"""
+import io
+import tarfile
+import time
+
+import pytest
+
+import grading_server
+
+def make_archive(*members):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for member, data in members:
+            archive.addfile(member, io.BytesIO(data) if data is not None else None)
+    return buffer.getvalue()
+
+def file_member(name, data):
+    member = tarfile.TarInfo(name)
+    member.size = len(data)
+    return member, data
+
+@pytest.fixture(params=["filter", "manual"])
+def extraction(request, monkeypatch):
+    """unpack с фильтром "data" и без него (Python до 3.11.4)"""
+    if request.param == "manual":
+        monkeypatch.delattr(tarfile, "data_filter", raising=False)
+    return request.param
+
+def test_unpack_finds_submission_root(extraction):
+    data = make_archive(file_member("repo/you_playwright/run_chromium.py", b"print(1)\n"))
+    root, directory = grading_server.unpack(data)
+    try:
+        assert root.endswith("repo")
+    finally:
+        grading_server.shutil.rmtree(directory)
+
+def test_unpack_rejects_paths_outside_directory(extraction):
+    with pytest.raises(ValueError):
+        grading_server.unpack(make_archive(file_member("../escape.py", b"x = 1\n")))
+
+def test_unpack_rejects_absolute_paths_without_filter(monkeypatch):
+    monkeypatch.delattr(tarfile, "data_filter", raising=False)
+    with pytest.raises(ValueError, match="вне каталога"):
+        grading_server.unpack(make_archive(file_member("/tmp/escape.py", b"x = 1\n")))
+
+def test_unpack_rejects_links_without_filter(monkeypatch):
+    monkeypatch.delattr(tarfile, "data_filter", raising=False)
+    link = tarfile.TarInfo("you_playwright/run_chromium.py")
+    link.type = tarfile.SYMTYPE
+    link.linkname = "/etc/passwd"
+    with pytest.raises(ValueError, match="недопустимый"):
+        grading_server.unpack(make_archive((link, None)))
+
+def test_worker_stop_kills_hung_process():
+    worker = grading_server.Worker()
+    future = worker.pool.submit(time.sleep, 600)
+    deadline = time.monotonic() + 60
+    while not worker.pid.value and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert worker.pid.value
+
+    started = time.monotonic()
+    worker.stop()
+    assert time.monotonic() - started < 30
+    assert future.done()
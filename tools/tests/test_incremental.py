@@ -0,0 +1,54 @@
+"""Инкрементальная проверка по истории git (tools/incremental.py)"""
+import subprocess
+
+import pytest
+
+import incremental
+import report
+import result_cache
+
+STAGES = ["structure", "syntax"]
+
+def git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+def commit_all(root, message):
+    git(root, "add", "-A")
+    git(root, "-c", "user.name=test", "-c", "user.email=test@example.com",
+        "commit", "-q", "-m", message)
+
+@pytest.fixture
+def work(tmp_path, monkeypatch):
+    """Репозиторий работы с файлами задания и отдельным кэшем/состоянием"""
+    root = tmp_path / "work"
+    project = root / report.PROJECT
+    project.mkdir(parents=True)
+    for fname in report.FILES:
+        (project / fname).write_text(f"print({fname!r})\n", encoding="utf-8")
+    git(root, "init", "-q")
+    commit_all(root, "работа")
+
+    cache = result_cache.ResultCache(str(tmp_path / "cache"))
+    monkeypatch.delenv("GRADER_NO_CACHE", raising=False)
+    monkeypatch.setattr(result_cache, "_default", cache)
+    monkeypatch.setattr(incremental, "ENABLED", True)
+    monkeypatch.setattr(incremental, "STATE_DIR", str(tmp_path / "state"))
+    yield root
+    cache.close()
+
+def test_only_changed_files_are_graded_again(work):
+    first = incremental.grade(str(work), STAGES)
+    assert not first.reused
+
+    assert sorted(incremental.grade(str(work), STAGES).reused) == sorted(report.FILES)
+
+    changed = report.FILES[0]
+    (work / report.PROJECT / changed).write_text("print(\n", encoding="utf-8")
+    commit_all(work, "правка")
+    third = incremental.grade(str(work), STAGES)
+    assert sorted(third.reused) == sorted(set(report.FILES) - {changed})
+    assert third.files[changed]["syntax"] != first.files[changed]["syntax"]
+
+def test_other_stages_invalidate_saved_state(work):
+    incremental.grade(str(work), STAGES)
+    assert not incremental.grade(str(work), ["structure"]).reused
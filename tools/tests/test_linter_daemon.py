@@ -0,0 +1,28 @@
+"""Клиент демона линтеров (tools/linter_daemon.py)"""
+import socket
+import threading
+
+import linter_daemon
+
+def silent_daemon(path):
+    """Сокет, который принимает соединение и молчит (зависший демон)"""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+    accepted = []
+    thread = threading.Thread(target=lambda: accepted.append(server.accept()), daemon=True)
+    thread.start()
+    return server, accepted
+
+def test_request_falls_back_when_daemon_does_not_answer(tmp_path):
+    path = str(tmp_path / "daemon.sock")
+    server, accepted = silent_daemon(path)
+    try:
+        assert linter_daemon.request("flake8", ["."], socket_path=path, timeout=0.2) is None
+    finally:
+        for connection, _ in accepted:
+            connection.close()
+        server.close()
+
+def test_request_without_daemon_returns_none(tmp_path):
+    assert linter_daemon.request("flake8", ["."], socket_path=str(tmp_path / "none.sock")) is None
@@ -0,0 +1,20 @@
+"""Асинхронный конвейер этапов проверки (tools/pipeline.py)"""
+import pipeline
+import report
+
+def test_missing_and_broken_files_are_reported_per_file(tmp_path):
+    project = tmp_path / report.PROJECT
+    project.mkdir()
+    missing, broken, *valid = report.FILES
+    (project / broken).write_text("print(\n", encoding="utf-8")
+    for fname in valid:
+        (project / fname).write_text(f"print({fname!r})\n", encoding="utf-8")
+
+    grading = pipeline.run(str(tmp_path), ["structure", "syntax"])
+
+    assert grading.structure_ok  # папка задания есть, не хватает одного файла
+    assert not grading.report().files_complete
+    assert not grading.files[missing]["exists"]
+    assert grading.files[broken]["exists"]
+    assert grading.files[broken]["syntax"] != grading.files[valid[0]]["syntax"]
+    assert not grading.reused
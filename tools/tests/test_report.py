@@ -0,0 +1,22 @@
+"""Единый движок отчёта (tools/report.py)"""
+import json
+
+import report
+import timing
+
+def test_render_spans_reach_timings(tmp_path, monkeypatch):
+    (tmp_path / report.PROJECT).mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("GITHUB_STEP_SUMMARY", raising=False)
+    monkeypatch.setattr(timing.timings, "enabled", True)
+    timing.timings.reset()
+
+    report.main(["--format", "markdown,json"], stages=["structure"])
+
+    spans = timing.load()["generate_summary"]
+    assert "report.markdown" in spans
+    assert "report.json" in spans
+    summary = (tmp_path / "SUMMARY.md").read_text(encoding="utf-8")
+    assert "`report.markdown`" in summary
+    with open(tmp_path / "report.json", encoding="utf-8") as f:
+        assert "report.json" in json.load(f)["timings"]["generate_summary"]
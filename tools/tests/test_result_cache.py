@@ -0,0 +1,35 @@
+"""Кэш результатов на диске и в памяти (tools/result_cache.py)"""
+import result_cache
+
+def test_entries_are_separated_by_namespace_and_version(tmp_path):
+    cache = result_cache.ResultCache(str(tmp_path))
+    try:
+        cache.put("flake8", "digest", "v1", {"errors": 2})
+        assert cache.get("flake8", "digest", "v1") == {"errors": 2}
+        assert cache.get("flake8", "digest", "v2") is None
+        assert cache.get("pylint", "digest", "v1") is None
+    finally:
+        cache.close()
+
+def test_least_recently_used_entries_are_evicted_over_size_limit(tmp_path):
+    cache = result_cache.ResultCache(str(tmp_path), max_bytes=200)
+    try:
+        payload = "x" * 80
+        cache.put("syntax", "a", "v", payload)
+        cache.put("syntax", "b", "v", payload)
+        assert cache.get("syntax", "a", "v") == payload  # «a» использована позже «b»
+        cache.put("syntax", "c", "v", payload)
+        assert cache.get("syntax", "b", "v") is None
+        assert cache.get("syntax", "a", "v") == payload
+        assert cache.get("syntax", "c", "v") == payload
+    finally:
+        cache.close()
+
+def test_memory_cache_evicts_least_recently_used():
+    memo = result_cache.MemoryCache(max_entries=2)
+    memo["a"] = 1
+    memo["b"] = 2
+    assert memo.get("a") == 1
+    memo["c"] = 3
+    assert list(memo) == ["a", "c"]
+    assert memo.get("b") is None
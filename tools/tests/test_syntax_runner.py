@@ -0,0 +1,36 @@
+"""Проверки синтаксиса с дисковым кэшем результатов (tools/syntax_runner.py)"""
+import result_cache
+import syntax_runner
+
+CHROMIUM = """\
+from playwright.sync_api import sync_playwright
+
+with sync_playwright() as p:
+    browser = p.chromium.launch()
+    page = browser.new_page()
+    page.goto("https://demoqa.com")
+    print(page.title())
+    browser.close()
+"""
+
+def test_identical_files_do_not_share_cache_entries(tmp_path):
+    project = tmp_path / "work" / syntax_runner.TASK.project_dir
+    project.mkdir(parents=True)
+    # run_firefox.py — точная копия run_chromium.py: тот же хэш содержимого
+    (project / "run_chromium.py").write_text(CHROMIUM, encoding="utf-8")
+    (project / "run_firefox.py").write_text(CHROMIUM, encoding="utf-8")
+    cache = result_cache.ResultCache(str(tmp_path / "cache"))
+    try:
+        files = {"run_chromium.py", "run_firefox.py"}
+        first = syntax_runner.run_syntax_checks(tmp_path / "work", cache, files)
+        second = syntax_runner.run_syntax_checks(tmp_path / "work", cache, files)
+    finally:
+        cache.close()
+
+    assert sorted(second["cached"]) == sorted(files)
+    for result in (first, second):
+        assert result["file_status"] == {"run_chromium.py": True, "run_firefox.py": False}
+        assert result["tests"]["test_chromium_syntax"]["file"] == "run_chromium.py"
+        assert result["tests"]["test_chromium_syntax"]["passed"]
+        assert result["tests"]["test_firefox_syntax"]["file"] == "run_firefox.py"
+        assert not result["tests"]["test_firefox_syntax"]["passed"]
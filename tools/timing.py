@@ -0,0 +1,112 @@
+"""Замеры времени этапов проверки
+
+    with timing.span("flake8"):
+        ...
+
+Замеры включаются переменной окружения GRADER_TIMINGS=1. В выключенном
+состоянии span() возвращает один и тот же пустой контекстный менеджер, так что
+накладные расходы — один вызов функции. GRADER_PROFILE=этап1,этап2 дополнительно
+снимает cProfile для перечисленных этапов в каталог profiles/<этап>.prof.
+
+Повторные замеры с одним именем суммируются (вызовы и общее время), поэтому
+в отчёте одна строка на этап независимо от числа файлов.
+"""
+import contextlib
+import cProfile
+import json
+import os
+import threading
+import time
+
+TIMINGS_FILE = "timings.json"
+PROFILE_DIR = "profiles"
+
+class Timings:
+    """Накопитель замеров процесса (потокобезопасный)"""
+
+    def __init__(self, enabled=None, profile=None):
+        if enabled is None:
+            enabled = bool(os.getenv("GRADER_TIMINGS"))
+        if profile is None:
+            profile = [s.strip() for s in os.getenv("GRADER_PROFILE", "").split(",") if s.strip()]
+        self.enabled = enabled or bool(profile)
+        self.profile = set(profile)
+        self.spans = {}
+        self.lock = threading.Lock()
+
+    def span(self, name):
+        if not self.enabled:
+            return _NOOP
+        return self._span(name)
+
+    @contextlib.contextmanager
+    def _span(self, name):
+        profiler = cProfile.Profile() if name in self.profile else None
+        if profiler is not None:
+            profiler.enable()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+                os.makedirs(PROFILE_DIR, exist_ok=True)
+                profiler.dump_stats(os.path.join(PROFILE_DIR, f"{name}.prof"))
+            self.add(name, elapsed)
+
+    def add(self, name, seconds):
+        """Учёт замера, сделанного вне span() (например, в другом процессе)"""
+        with self.lock:
+            entry = self.spans.setdefault(name, {"calls": 0, "total_ms": 0.0})
+            entry["calls"] += 1
+            entry["total_ms"] += seconds * 1000
+
+    def reset(self):
+        """Сброс накопленных замеров (долгоживущий процесс: замеры по заданиям)"""
+        with self.lock:
+            self.spans = {}
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                name: {"calls": entry["calls"], "total_ms": round(entry["total_ms"], 3)}
+                for name, entry in self.spans.items()
+            }
+
+    def save(self, section, path=TIMINGS_FILE):
+        """Запись замеров своего скрипта в общий файл (другие разделы сохраняются)"""
+        if not self.enabled:
+            return
+        data = load(path)
+        data[section] = self.as_dict()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+_NOOP = contextlib.nullcontext()
+
+def load(path=TIMINGS_FILE):
+    """Замеры из файла: {скрипт: {этап: {"calls", "total_ms"}}}"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def render_markdown(data):
+    """Свёрнутая таблица замеров для SUMMARY.md (пустой список, если замеров нет)"""
+    if not data:
+        return []
+    lines = ["<details>", "<summary>⏱️ Время этапов проверки</summary>", ""]
+    lines.append("| Скрипт | Этап | Вызовов | Время, мс |")
+    lines.append("|--------|------|---------|-----------|")
+    for section, spans in data.items():
+        for name, entry in spans.items():
+            lines.append(f"| {section} | `{name}` | {entry['calls']} | {entry['total_ms']:.1f} |")
+    lines.append("")
+    lines.append("</details>")
+    lines.append("")
+    return lines
+
+timings = Timings()
+span = timings.span
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Режим наблюдения: перепроверка работы при каждом сохранении файла
+
+Следит за папкой you_playwright/ через inotify (ctypes, без сторонних пакетов),
+а там, где inotify недоступен, — опросом mtime. Серия быстрых сохранений
+сливается в одну перепроверку (debounce). Перепроверяются только изменённые
+файлы: синтаксис — тестами этих файлов, линтеры — в текущем процессе
+с уже импортированными flake8 и pylint (остальные файлы берутся из памяти).
+
+    python tools/watch.py               # или: python tools/generate_summary.py --watch
+    python tools/watch.py --poll        # принудительно опросом
+"""
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+import check_linters
+import linter_daemon
+import report
+import syntax_runner
+
+DEBOUNCE = 0.15      # секунд тишины, после которых серия сохранений проверяется
+POLL_INTERVAL = 0.25  # период опроса без inotify
+
+# === НАБЛЮДАТЕЛИ ===
+
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_IGNORED = 0x8000
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT = struct.Struct("iIII")  # struct inotify_event без имени: wd, mask, cookie, len
+
+class InotifyWatcher:
+    """События изменения файлов каталога от ядра (Linux)"""
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify недоступен")
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch {directory}")
+        self.lost = False  # каталог удалён или перемещён
+
+    def wait(self, timeout=None):
+        """Имена изменённых файлов (пустое множество — истёк таймаут)"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        data = os.read(self.fd, 64 * 1024)
+        names, offset = set(), 0
+        while offset < len(data):
+            _, mask, _, length = EVENT.unpack_from(data, offset)
+            offset += EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                self.lost = True
+            elif name:
+                names.add(os.fsdecode(name))
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Обнаружение изменений сравнением размера и mtime файлов каталога"""
+
+    def __init__(self, directory, interval=POLL_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.lost = False
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        try:
+            with os.scandir(self.directory) as entries:
+                return {
+                    entry.name: (st.st_size, st.st_mtime_ns)
+                    for entry in entries if entry.is_file()
+                    for st in (entry.stat(),)
+                }
+        except FileNotFoundError:
+            self.lost = True
+            return {}
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            if self.lost:
+                return set()
+            names = {name for name in current.keys() | self.snapshot.keys()
+                     if current.get(name) != self.snapshot.get(name)}
+            self.snapshot = current
+            if names:
+                return names
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            pause = self.interval if deadline is None else min(self.interval,
+                                                               deadline - time.monotonic())
+            time.sleep(max(0.0, pause))
+
+    def close(self):
+        pass
+
+def open_watcher(directory, poll=False):
+    """inotify, если доступен, иначе опрос"""
+    if not poll:
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError) as e:
+            print(f"💡 inotify недоступен ({e}), используется опрос")
+    return PollingWatcher(directory)
+
+def next_batch(watcher, debounce=DEBOUNCE):
+    """Ожидание изменений и слияние серии событий до паузы в debounce секунд"""
+    changed = set()
+    while not changed and not watcher.lost:
+        changed = watcher.wait()
+    while not watcher.lost:
+        more = watcher.wait(debounce)
+        if not more:
+            break
+        changed |= more
+    return changed
+
+# === ПЕРЕПРОВЕРКА ===
+
+class Session:
+    """Результаты работы, обновляемые по изменённым файлам"""
+
+    def __init__(self, root=".", linters=True, out=sys.stdout):
+        self.root = root
+        self.linters_enabled = linters
+        self.out = out
+        self.syntax = None
+        self.linters = None
+        # Линтеры в этом процессе: импорт один раз, диагностика неизменённых
+        # файлов — из памяти check_linters
+        check_linters.IN_PROCESS = True
+        if linters:
+            linter_daemon.warm_up()
+
+    def update(self, files=None):
+        """Перепроверка файлов files (None — всей работы) и вывод отчёта"""
+        started = time.perf_counter()
+        structure_ok, structure_files = report.check_structure(self.root)
+        result = syntax_runner.run_syntax_checks(self.root, files=files)
+        if self.syntax is None or files is None:
+            self.syntax = result
+        else:
+            for key in ("file_status", "tests", "findings", "limits"):
+                self.syntax[key].update(result[key])
+        quick_ms = (time.perf_counter() - started) * 1000
+
+        w = self.out.write
+        w("\n" + "=" * 60 + "\n")
+        w(f"🔄 {time.strftime('%H:%M:%S')} — "
+          f"{', '.join(sorted(files)) if files is not None else 'вся работа'}\n")
+        for fname in sorted(result["file_status"]):
+            mark = "✅" if result["file_status"][fname] else "❌"
+            w(f"   {mark} {fname}: синтаксис\n")
+        w(f"   ⚡ структура и синтаксис: {quick_ms:.0f} мс\n")
+        self.out.flush()
+
+        if self.linters_enabled and not check_linters.find_missing(self.root):
+            self.linters = check_linters.collect_results(self.root)
+        else:
+            self.linters = None
+        model = report.build_report(structure_ok, structure_files, self.syntax, self.linters)
+        w("\n")
+        report.render_markdown(model, self.out)
+        w(f"\n⏱️ Обновлено за {(time.perf_counter() - started) * 1000:.0f} мс\n")
+        self.out.flush()
+        return model
+
+def affected(names):
+    """Изменённые файлы, которые влияют на проверки"""
+    return {name for name in names if name in report.FILES}
+
+def wait_for_project(project, interval=POLL_INTERVAL):
+    if project.is_dir():
+        return
+    print(f"⏳ Ожидание папки {project} ...")
+    while not project.is_dir():
+        time.sleep(interval)
+
+def watch(root=".", poll=False, debounce=DEBOUNCE, linters=True):
+    """Цикл наблюдения (до Ctrl+C)"""
+    project = Path(root) / report.PROJECT
+    session = Session(root, linters)
+    session.update()
+    while True:
+        wait_for_project(project)
+        watcher = open_watcher(project, poll)
+        try:
+            while not watcher.lost:
+                names = affected(next_batch(watcher, debounce))
+                if names:
+                    session.update(names)
+        finally:
+            watcher.close()
+        # Папку удалили или заменили: показать это и ждать её появления
+        session.update()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Перепроверка работы при сохранении файлов")
+    parser.add_argument("root", nargs="?", default=".", help="каталог работы")
+    parser.add_argument("--poll", action="store_true", help="опрос вместо inotify")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE,
+                        help="пауза после последнего сохранения, с")
+    parser.add_argument("--no-linters", action="store_true", help="без flake8 и pylint")
+    args = parser.parse_args(argv)
+    print(f"👀 Наблюдение за {Path(args.root) / report.PROJECT} (Ctrl+C — выход)")
+    try:
+        watch(args.root, args.poll, args.debounce, not args.no_linters)
+    except KeyboardInterrupt:
+        print("\n👋 Наблюдение остановлено")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())